@@ -1,28 +1,28 @@
 import os
 import sys
-from PIL import Image, ImageDraw
-import argparse
+import time
 import numpy as np
-from collections import namedtuple
 
-from src.helper import *
+# Only lightweight modules are imported here. PIL and yaml are loaded on first
+# use, the render pipeline (clipping, ordering, kernels) when a render starts,
+# and each rasterizer or optional subsystem (blending, sphere LOD) by the branch
+# that needs it, so short jobs only pay for what their scene contains.
+from src.helper import (Point, Colour, load_config, create_directories, print_debug_info, write_debug_info,
+                        draw_bounding_box, material_opacity, object_opacity)
 from src.canvas import Canvas
-from src.raster.triangle import *
-from src.raster.circle import *
-from src.raster.line import *
-from src.raster.polygon import *
-from src.transform import *
-from src.raster.raster_help import *
-from src.camera import Camera
-from src.geometry import generate_sphere_mesh
-
-Point3D = namedtuple('Point3D', ['x', 'y', 'z'])
+from src.transform import create_translation_matrix, create_rotation_matrix, create_scaling_matrix
+from src.camera import Camera, frustum_planes
+from src.render3d import (is_3d, has_edges, model_matrix_for, object_mesh, object_center, local_center, project_vertices,
+                          shade_faces, face_normals, instance_model_matrices, instance_colours, cull_instances,
+                          project_instances, shade_instances)
+
 DIRECTORIES_TO_CREATE = ["src", "inputs", "outputs"]
 
 class Scene:
-    """Parses and holds the scene configuration."""
-    def __init__(self, config_path):
-        config = load_config(config_path)
+    """Parses and holds the scene configuration (a YAML path or an already-parsed dict)."""
+    def __init__(self, config):
+        if not isinstance(config, dict):
+            config = load_config(config)
         if not config or 'scene' not in config:
             raise ValueError("Invalid or empty configuration.")
         
@@ -31,6 +31,7 @@ class Scene:
         self.materials = scene_data['materials']
         self.objects = scene_data['objects']
         self.lights = scene_data.get('lights', []) # Use .get for safety
+        self.renderer_options = scene_data.get('renderer', {}).get('options', {})
         
         cam_config = scene_data['camera']
         self.camera_type = cam_config['type']
@@ -51,8 +52,26 @@ class Scene:
             return [obj for obj in self.objects if obj['name'] in objects_to_render]
         return self.objects
 
-def render_scene(scene, objects_to_render=None, debug=False, bb=False):
-    """Renders the scene based on the provided configuration."""
+DEFAULT_OUTPUT_PATH = os.path.join("outputs", "rendered_scene.png")
+
+def resolve_deferred(canvas, deferred_edges, ambient_light, directional_light):
+    """Shades the faces left visible by the pending deferred 3D objects, then draws their edges on top."""
+    canvas.flush_blend()
+    canvas.visibility.resolve(canvas.image, ambient_light, directional_light)
+    if deferred_edges:
+        from src.raster.line import draw_clipped_line
+        for segment, edge_color, object_id in deferred_edges:
+            draw_clipped_line(segment, edge_color, canvas.visibility.edge_draw(canvas.draw, object_id))
+        deferred_edges.clear()
+
+def render_scene(scene, objects_to_render=None, debug=False, bb=False, output_path=DEFAULT_OUTPUT_PATH, show=True,
+                 compress_level=None, visibility_path=None):
+    """
+    Renders the scene based on the provided configuration and returns the Canvas.
+    Pass output_path=None and show=False to skip encoding and keep only the pixels
+    (see Canvas.to_array). With the `deferred` renderer option, canvas.visibility
+    holds the visibility buffer, which is also saved to `visibility_path` if given.
+    """
     width = scene.settings['width']
     height = scene.settings['height']
     bg_color = tuple(scene.settings['background_color'])
@@ -70,9 +89,60 @@ def render_scene(scene, objects_to_render=None, debug=False, bb=False):
     ambient_light = next((l for l in scene.lights if l['type'] == 'ambient'), None)
     directional_light = next((l for l in scene.lights if l['type'] == 'directional'), None)
 
+    # Draw opaque 3D objects front to back so the depth test rejects hidden faces early,
+    # then translucent ones (materials with an `opacity` below 1) back to front over them
+    from src.raster import kernels
+    from src.raster.clip import ClipStats, clip_line, clip_circle, polygon_visible
+    from src.ordering import (order_render_list, face_order, view_depths, front_to_back, count_depth_writes,
+                              print_overdraw_report)
+    options = scene.renderer_options
+    # Rasterizer inner loops run on Numba when it is installed, NumPy otherwise (see src/raster/kernels)
+    kernels.set_backend(options.get('kernel_backend', 'auto'))
+    # 3D faces keep this many fractional bits of screen position and share edges without
+    # overlaps or cracks (top-left rule); 0 truncates vertices to whole pixels instead
+    subpixel_bits = options.get('subpixel_bits', 8)
+    if not isinstance(subpixel_bits, int) or not 0 <= subpixel_bits <= 16:
+        raise ValueError(f"subpixel_bits must be an integer from 0 to 16, got {subpixel_bits!r}.")
+    sort_faces = options.get('sort_faces', False)
+    config_rank = {id(obj): i for i, obj in enumerate(render_list)}
+    render_list = order_render_list(render_list, view_matrix, is_3d, object_center,
+                                    lambda obj: object_opacity(obj, scene.materials) < 1,
+                                    sort_opaque=options.get('sort_objects', True), has_edges=has_edges)
+    pixel_writes = 0
+    drawn_faces = []
+    # 2D primitives are clipped to the canvas so their cost scales with visible pixels
+    clip_stats = ClipStats()
+
+    # Pick sphere tessellation from projected size instead of always using the configured maximum
+    sphere_lod_enabled = options.get('sphere_lod', True)
+    if sphere_lod_enabled:
+        from src.lod import sphere_lod, DEFAULT_LOD_TOLERANCE
+        lod_tolerance = options.get('lod_tolerance', DEFAULT_LOD_TOLERANCE)
+
+    # Rasterize repeated 2D shapes once and paste the cached coverage mask afterwards
+    use_stamps = options.get('stamp_cache', True)
+    if use_stamps:
+        from src.raster.stamp import stamp_cache, stamp_circle, stamp_polygon, STAMP_CACHE_MB
+        stamp_cache.max_bytes = int(options.get('stamp_cache_mb', STAMP_CACHE_MB) * 1024 * 1024)
+
+    # Deferred mode rasterizes 3D faces into depth plus (object id, face id) only, and lights
+    # each visible face once when a run of 3D objects ends. Their edges are drawn after that.
+    deferred = options.get('deferred', False) or visibility_path is not None
+    if deferred:
+        from src.deferred import VisibilityBuffer
+        canvas.visibility = VisibilityBuffer(width, height)
+        deferred_edges = []
+
     y_offset = 10
     for obj in render_list:
         name = obj['name']
+        alpha = object_opacity(obj, scene.materials)
+        translucent = alpha < 1
+        # Translucent shapes are composited in the canvas' float buffer; write it back before drawing opaquely
+        if canvas.blend is not None and (debug or bb or not translucent):
+            canvas.flush_blend()
+        if deferred and canvas.visibility.pending() and (translucent or not is_3d(obj)):
+            resolve_deferred(canvas, deferred_edges, ambient_light, directional_light)
         if debug:
             print_debug_info(name, obj, canvas)
             y_offset = write_debug_info(name, obj, canvas, y_offset)
@@ -84,8 +154,16 @@ def render_scene(scene, objects_to_render=None, debug=False, bb=False):
             material = scene.materials[material_name]
             color = Colour(*material['color'])
         except KeyError:
-            print(f"Warning: Material '{obj.get('material', 'N/A')}' not found or invalid for object '{name}'. Skipping.")
+            print(f"Warning: Material '{obj.get('material', 'N/A')}' not found or invalid for object '{name}'. Skipping.",
+                  file=sys.stderr)
+            continue
+        if alpha == 0:
             continue
+        # Translucent 2D shapes are rasterized into a collector, then composited once per pixel
+        draw_target = canvas.draw
+        if translucent:
+            from src.raster.blend import CoverageCollector, blend_pixels, blend_face
+            draw_target = CoverageCollector(canvas.clip_rect)
 
         # Process transformations
         final_transform_matrix = np.identity(3)
@@ -108,8 +186,10 @@ def render_scene(scene, objects_to_render=None, debug=False, bb=False):
                 transformed_v = np.dot(final_transform_matrix, homogeneous_v)
                 transformed_vertices.append([transformed_v[0], transformed_v[1]])
             
+            from src.raster.triangle import draw_triangle
             verts = [Point(*canvas.world_to_screen(v[0], v[1])) for v in transformed_vertices]
-            draw_triangle(verts[0], verts[1], verts[2], color, canvas.draw, fill=True)
+            draw_triangle(verts[0], verts[1], verts[2], color, draw_target, fill=True,
+                          clip_rect=canvas.clip_rect, clip_stats=clip_stats)
         elif obj['type'] == 'circle':
             # Note: Transformations on circles require more care.
             # Scaling can make it an ellipse, and rotation is only visible if it's not a solid color.
@@ -120,7 +200,11 @@ def render_scene(scene, objects_to_render=None, debug=False, bb=False):
             
             center = Point(*canvas.world_to_screen(transformed_c[0], transformed_c[1]))
             radius = obj['radius']
-            draw_circle_int(center, radius, color, canvas.draw, fill=True)
+            if clip_circle(center.x, center.y, radius, canvas.clip_rect, clip_stats):
+                stamp_target = canvas.blend_buffer() if translucent else canvas.image
+                if not (use_stamps and stamp_circle(stamp_target, center.x, center.y, radius, color, canvas.clip_rect, alpha=alpha)):
+                    from src.raster.circle import draw_circle_int
+                    draw_circle_int(center, radius, color, draw_target, fill=True, clip_rect=canvas.clip_rect)
         elif obj['type'] == 'line':
             original_vertices = [obj['start'], obj['end']]
             transformed_vertices = []
@@ -131,201 +215,386 @@ def render_scene(scene, objects_to_render=None, debug=False, bb=False):
 
             start = Point(*canvas.world_to_screen(transformed_vertices[0][0], transformed_vertices[0][1]))
             end = Point(*canvas.world_to_screen(transformed_vertices[1][0], transformed_vertices[1][1]))
-            draw_line_bresenham(start.x, start.y, end.x, end.y, color, canvas.draw)
+            segment = clip_line(start.x, start.y, end.x, end.y, canvas.clip_rect, clip_stats)
+            if segment:
+                from src.raster.line import draw_clipped_line
+                draw_clipped_line(segment, color, draw_target)
         elif obj['type'] == 'polygon':
-            original_vertices = obj['vertices']
-            transformed_vertices = []
-            for v in original_vertices:
-                homogeneous_v = np.array([v[0], v[1], 1])
-                transformed_v = np.dot(final_transform_matrix, homogeneous_v)
-                transformed_vertices.append([transformed_v[0], transformed_v[1]])
-                
-            verts = [Point(*canvas.world_to_screen(v[0], v[1])) for v in transformed_vertices]
-            scanline_fill_custom(verts, color, canvas.draw)
+            from src.raster.triangulate import triangulate_polygon
+            from src.raster.triangle import fill_triangles
+            # Triangulate in config space (cached by vertex content), so moving the polygon reuses it
+            holes = obj.get('holes', [])
+            triangles = triangulate_polygon(obj['vertices'], holes)
+            original_vertices = np.array([list(v) for v in obj['vertices']] + [list(v) for hole in holes for v in hole], dtype=float)
+            homogeneous = np.column_stack([original_vertices, np.ones(len(original_vertices))])
+            transformed_vertices = np.dot(homogeneous, final_transform_matrix.T)
+            screen_vertices = np.array([canvas.world_to_screen(v[0], v[1]) for v in transformed_vertices])
+            if polygon_visible(screen_vertices, canvas.clip_rect, clip_stats):
+                stamp_target = canvas.blend_buffer() if translucent else canvas.image
+                if not (use_stamps and stamp_polygon(stamp_target, screen_vertices, triangles, color, canvas.clip_rect, alpha=alpha)):
+                    fill_triangles(screen_vertices[triangles], color, draw_target, clip_rect=canvas.clip_rect)
+        elif obj['type'] == 'path':
+            from src.raster.bezier import path_cubics, flatten_cubics, FLATNESS_TOLERANCE
+            from src.raster.line import draw_clipped_line
+            # Bezier curves are affine invariant, so transforming the control points transforms the curve
+            cubics = path_cubics(obj['start'], obj.get('segments', []))
+            if len(cubics) == 0:
+                print(f"Warning: Path '{name}' has no segments. Skipping.", file=sys.stderr)
+                continue
+            control_points = cubics.reshape(-1, 2)
+            homogeneous = np.column_stack([control_points, np.ones(len(control_points))])
+            transformed = np.dot(homogeneous, final_transform_matrix.T)[:, :2]
+            screen_cubics = canvas.world_to_screen_points(transformed).reshape(-1, 4, 2)
+            # The curve lies inside its control points' bounding box, so that box decides visibility
+            if not polygon_visible(screen_cubics.reshape(-1, 2), canvas.clip_rect, clip_stats):
+                continue
+            # Flatten in pixel space, so the segment count follows the curve's size on screen
+            points = flatten_cubics(screen_cubics, obj.get('tolerance', options.get('flatness_tolerance', FLATNESS_TOLERANCE)))
+            # Truncate to pixels like world_to_screen, dropping points that land on the same pixel
+            pixels = points.astype(int)
+            pixels = pixels[np.concatenate([[True], np.any(pixels[1:] != pixels[:-1], axis=1)])]
+            if len(pixels) < 2:
+                continue  # The whole path falls on one pixel
+            if debug:
+                print(f"  - Path: {len(cubics)} segments flattened to {len(points) - 1} lines")
+            if obj.get('fill', False):
+                from src.raster.triangulate import triangulate_polygon
+                from src.raster.triangle import fill_triangles
+                triangles = triangulate_polygon(pixels)
+                stamp_target = canvas.blend_buffer() if translucent else canvas.image
+                if not (use_stamps and stamp_polygon(stamp_target, pixels, triangles, color, canvas.clip_rect, alpha=alpha)):
+                    fill_triangles(pixels[triangles], color, draw_target, clip_rect=canvas.clip_rect)
+                stroke_color, stroke_alpha = None, 1.0
+                if obj.get('edge_color') in scene.materials:
+                    edge_material = scene.materials[obj['edge_color']]
+                    stroke_color, stroke_alpha = Colour(*edge_material['color']), material_opacity(edge_material)
+                    pixels = np.concatenate([pixels, pixels[:1]])
+                if translucent:
+                    # Blend the fill now so the outline is composited over it
+                    blend_pixels(canvas.blend_buffer(), *draw_target.pixels(), color, alpha)
+                    draw_target = CoverageCollector(canvas.clip_rect)
+            else:
+                stroke_color, stroke_alpha = color, alpha
+            if stroke_color:
+                for (x0, y0), (x1, y1) in zip(pixels[:-1], pixels[1:]):
+                    segment = clip_line(x0, y0, x1, y1, canvas.clip_rect, clip_stats)
+                    if segment:
+                        draw_clipped_line(segment, stroke_color, draw_target)
+                # What the collector holds now is the stroke, blended below
+                color, alpha = stroke_color, stroke_alpha
         
-        elif obj['type'] == 'sphere':
-            # 1. Generate the sphere mesh
-            radius = obj.get('radius', 1)
-            sectors = obj.get('sectors', 36)
-            stacks = obj.get('stacks', 18)
-            local_vertices, faces = generate_sphere_mesh(radius, sectors, stacks)
-            
-            # 2. Apply transformations (same as cube)
-            model_matrix = np.identity(4)
-            # Apply a translation for the sphere's center
-            center = obj.get('center', [0, 0, 0])
-            center_translation = create_3d_translation_matrix(*center)
-            model_matrix = np.dot(center_translation, model_matrix)
-
-            if 'transform' in obj:
-                for t in reversed(obj['transform']):
-                    m = np.identity(4)
-                    if t['type'] == 'translate_3d':
-                        m = create_3d_translation_matrix(*t['offset'])
-                    elif t['type'] == 'rotate_x':
-                        m = create_3d_rotation_matrix_x(t['angle'])
-                    elif t['type'] == 'rotate_y':
-                        m = create_3d_rotation_matrix_y(t['angle'])
-                    elif t['type'] == 'rotate_z':
-                        m = create_3d_rotation_matrix_z(t['angle'])
-                    elif t['type'] == 'scale_3d':
-                        m = create_3d_scaling_matrix(*t['factor'])
-                    model_matrix = np.dot(model_matrix, m)
-            
+        elif obj['type'] == 'instances':
+            from src.raster.triangle import fill_face
+            from src.raster.line import draw_clipped_line
+            # 1. Build the shared mesh once and cull every instance against the frustum
+            base = obj['base']
+            model_matrices = instance_model_matrices(obj)
+            if len(model_matrices) == 0:
+                continue
+            local_vertices, faces = object_mesh(base)
+            colours = instance_colours(obj, scene.materials, color)
+            # Far-plane culling is skipped to match the non-instanced path, which does not clip against it.
+            # A sphere's configured mesh bounds every coarser level, so culling can come first.
+            visible = cull_instances(frustum_planes(view_projection_matrix, include_far=False), model_matrices, local_vertices)
+            if debug:
+                print(f"  - Instances: {int(visible.sum())} of {len(visible)} inside the view frustum")
+            if not visible.any():
+                continue
+            instance_ids = np.flatnonzero(visible)
+            model_matrices = model_matrices[visible]
+            colours = [c for c, keep in zip(colours, visible) if keep]
+            if base['type'] == 'sphere' and sphere_lod_enabled and base.get('lod', True):
+                # One shared level for the visible instances, picked for the nearest of them
+                sectors, stacks, screen_radius = sphere_lod(base, model_matrices, scene.camera, scene.camera_type, height, lod_tolerance)
+                local_vertices, faces = object_mesh(base, (sectors, stacks))
+                if debug:
+                    print(f"  - LOD: {sectors}x{stacks} sectors/stacks (largest screen radius {screen_radius:.1f} px)")
+            if options.get('sort_objects', True) or translucent:
+                instance_order = front_to_back(view_depths(view_matrix, np.dot(model_matrices, local_center(base))))
+                if translucent:
+                    instance_order = instance_order[::-1]
+                model_matrices = model_matrices[instance_order]
+                instance_ids = instance_ids[instance_order]
+                colours = [colours[i] for i in instance_order]
+
+            # 2. Transform and shade all instances in bulk
+            mvp_matrices = np.matmul(view_projection_matrix, model_matrices)
+            projected_instances = project_instances(mvp_matrices, local_vertices, width, height, snap=not subpixel_bits)
+            world_vertices = np.matmul(local_vertices, model_matrices.transpose(0, 2, 1))
+            if deferred and not translucent:
+                normals, instance_valid = face_normals(world_vertices, faces)
+                object_ids = [canvas.visibility.add_object(f"{name}[{instance_ids[n]}]", normals[n], colours[n])
+                              for n in range(len(colours))]
+            else:
+                instance_face_colours = shade_instances(world_vertices, faces, colours, ambient_light, directional_light)
+                instance_valid = [[c is not None for c in face_colours] for face_colours in instance_face_colours]
+
+            edge_color = None
+            if 'edges' in base and 'edge_color' in base:
+                edge_material = scene.materials.get(base['edge_color'])
+                if edge_material:
+                    edge_color = Colour(*edge_material['color'])
+
+            # 3. Rasterize each instance's faces, then its edges on top
+            for n, projected_vertices in enumerate(projected_instances):
+                instance_faces = range(len(faces))
+                if translucent:
+                    # Back to front, so each face blends over the ones behind it
+                    instance_faces = face_order(view_matrix, world_vertices[n], faces)[::-1]
+                for i in instance_faces:
+                    if not instance_valid[n][i]:
+                        continue
+                    face_vertices = [projected_vertices[j] for j in faces[i]]
+                    if translucent:
+                        blend_face(face_vertices, instance_face_colours[n][i], alpha, canvas.blend_buffer(), canvas.z_buffer, subpixel_bits)
+                        continue
+                    if deferred:
+                        pixel_writes += fill_face(face_vertices, None, None, canvas.z_buffer, canvas.visibility.ids, (object_ids[n], i),
+                                                  subpixel_bits=subpixel_bits)
+                    else:
+                        pixel_writes += fill_face(face_vertices, instance_face_colours[n][i], canvas.draw, canvas.z_buffer, subpixel_bits=subpixel_bits)
+                    if debug:
+                        drawn_faces.append((config_rank[id(obj)], instance_ids[n] * len(faces) + i, face_vertices))
+                if edge_color:
+                    edge_target = CoverageCollector(canvas.clip_rect) if translucent else canvas.draw
+                    for edge in base['edges']:
+                        p1 = projected_vertices[edge[0]]
+                        p2 = projected_vertices[edge[1]]
+                        segment = clip_line(p1.x, p1.y, p2.x, p2.y, canvas.clip_rect, clip_stats)
+                        if segment and deferred and not translucent:
+                            deferred_edges.append((segment, edge_color, object_ids[n]))
+                        elif segment:
+                            draw_clipped_line(segment, edge_color, edge_target)
+                    if translucent:
+                        blend_pixels(canvas.blend_buffer(), *edge_target.pixels(), edge_color, material_opacity(edge_material))
+
+        elif is_3d(obj):
+            from src.raster.triangle import fill_face
+            from src.raster.line import draw_clipped_line
+            # 1. Build the mesh and project all of its vertices in one go
+            model_matrix = model_matrix_for(obj)
+            tessellation = None
+            if obj['type'] == 'sphere' and sphere_lod_enabled and obj.get('lod', True):
+                sectors, stacks, screen_radius = sphere_lod(obj, model_matrix, scene.camera, scene.camera_type, height, lod_tolerance)
+                tessellation = (sectors, stacks)
+                if debug:
+                    print(f"  - LOD: {sectors}x{stacks} sectors/stacks (screen radius {screen_radius:.1f} px)")
+            local_vertices, faces = object_mesh(obj, tessellation)
             mvp_matrix = np.dot(view_projection_matrix, model_matrix)
-            transformed_vertices_3d = [np.dot(mvp_matrix, v) for v in local_vertices]
-
-            projected_vertices = []
-            for v in transformed_vertices_3d:
-                depth_z = v[2]
-                if v[3] != 0:
-                    v /= v[3]
-                screen_x = (v[0] + 1) * 0.5 * width
-                screen_y = (1 - v[1]) * 0.5 * height
-                projected_vertices.append(Point3D(int(screen_x), int(screen_y), depth_z))
-
-            # 3. Render faces with lighting (same as cube)
-            for face in faces:
-                face_world_verts = [np.dot(model_matrix, local_vertices[i]) for i in face]
-                v0, v1, v2 = face_world_verts[0][:3], face_world_verts[1][:3], face_world_verts[2][:3]
-                normal = np.cross(v1 - v0, v2 - v0)
-                if np.linalg.norm(normal) == 0:
+            projected_vertices = project_vertices(mvp_matrix, local_vertices, width, height, snap=not subpixel_bits)
+            world_vertices = np.dot(local_vertices, model_matrix.T)
+
+            # 2. Fill the faces (with Z-buffering and flat shading)
+            if deferred and not translucent:
+                normals, valid = face_normals(world_vertices, faces)
+                object_id = canvas.visibility.add_object(name, normals, color)
+            else:
+                face_colours = shade_faces(world_vertices, faces, color, ambient_light, directional_light)
+                valid = [c is not None for c in face_colours]
+            face_indices = range(len(faces))
+            if sort_faces or translucent:
+                face_indices = face_order(view_matrix, world_vertices, faces)
+                if translucent:
+                    # Back to front, so each face blends over the ones behind it
+                    face_indices = face_indices[::-1]
+            for i in face_indices:
+                if not valid[i]:
                     continue
-                normal = normal / np.linalg.norm(normal)
-
-                final_color = color
-                if directional_light:
-                    light_dir = np.array(directional_light['direction'])
-                    light_dir = light_dir / np.linalg.norm(light_dir)
-                    diffuse_intensity = max(0, np.dot(normal, light_dir))
-                    ambient_intensity = ambient_light['intensity'] if ambient_light else 0.1
-                    total_intensity = ambient_intensity + (diffuse_intensity * directional_light.get('intensity', 1.0))
-                    final_color = Colour(
-                        min(255, color.r * total_intensity),
-                        min(255, color.g * total_intensity),
-                        min(255, color.b * total_intensity)
-                    )
-
-                face_vertices = [projected_vertices[i] for i in face]
-                scanline_fill(face_vertices, final_color, canvas.draw, canvas.z_buffer)
-
-        elif obj['type'] == 'cube_3d':
-            center = obj['center']
-            size = obj['size']
-            s = size / 2
-            
-            vertices_3d = [
-                np.array([center[0] - s, center[1] - s, center[2] - s, 1]),
-                np.array([center[0] + s, center[1] - s, center[2] - s, 1]),
-                np.array([center[0] + s, center[1] + s, center[2] - s, 1]),
-                np.array([center[0] - s, center[1] + s, center[2] - s, 1]),
-                np.array([center[0] - s, center[1] - s, center[2] + s, 1]),
-                np.array([center[0] + s, center[1] - s, center[2] + s, 1]),
-                np.array([center[0] + s, center[1] + s, center[2] + s, 1]),
-                np.array([center[0] - s, center[1] + s, center[2] + s, 1]),
-            ]
-
-            model_matrix = np.identity(4)
-            if 'transform' in obj:
-                for t in reversed(obj['transform']):
-                    if t['type'] == 'translate_3d':
-                        m = create_3d_translation_matrix(*t['offset'])
-                    elif t['type'] == 'rotate_x':
-                        m = create_3d_rotation_matrix_x(t['angle'])
-                    elif t['type'] == 'rotate_y':
-                        m = create_3d_rotation_matrix_y(t['angle'])
-                    elif t['type'] == 'rotate_z':
-                        m = create_3d_rotation_matrix_z(t['angle'])
-                    elif t['type'] == 'scale_3d':
-                        m = create_3d_scaling_matrix(*t['factor'])
-                    model_matrix = np.dot(model_matrix, m)
-            
-            mvp_matrix = np.dot(view_projection_matrix, model_matrix)
-            
-            transformed_vertices_3d = [np.dot(mvp_matrix, v) for v in vertices_3d]
-
-            projected_vertices = []
-            for v in transformed_vertices_3d:
-                # Store the original z value for depth testing
-                depth_z = v[2]
-
-                # Perspective divide (convert from homogeneous to Cartesian coordinates)
-                if v[3] != 0:
-                    v /= v[3]
-                
-                # Map from Normalized Device Coordinates (NDC) to screen coordinates
-                screen_x = (v[0] + 1) * 0.5 * width
-                screen_y = (1 - v[1]) * 0.5 * height # Y is inverted in screen space
-                projected_vertices.append(Point3D(int(screen_x), int(screen_y), depth_z))
-            
-            # 1. Fill the faces (with Z-buffering and shading)
-            if 'faces' in obj:
-                for face in obj['faces']:
-                    # Get the vertices of the face in world space (before projection)
-                    face_world_verts = [np.dot(model_matrix, vertices_3d[i]) for i in face]
-
-                    # Calculate the face normal in world space
-                    v0, v1, v2 = face_world_verts[0][:3], face_world_verts[1][:3], face_world_verts[2][:3]
-                    normal = np.cross(v1 - v0, v2 - v0)
-                    normal = normal / np.linalg.norm(normal)
-
-                    # --- Lighting Calculation ---
-                    final_color = color
-                    if directional_light:
-                        light_dir = np.array(directional_light['direction'])
-                        light_dir = light_dir / np.linalg.norm(light_dir)
-                        
-                        # Calculate diffuse intensity (dot product)
-                        diffuse_intensity = max(0, np.dot(normal, light_dir))
-                        
-                        # Combine with ambient light
-                        ambient_intensity = ambient_light['intensity'] if ambient_light else 0.1
-                        total_intensity = ambient_intensity + (diffuse_intensity * directional_light.get('intensity', 1.0))
-                        
-                        # Apply to the material color
-                        final_color = Colour(
-                            min(255, color.r * total_intensity),
-                            min(255, color.g * total_intensity),
-                            min(255, color.b * total_intensity)
-                        )
-
-                    face_vertices = [projected_vertices[i] for i in face]
-                    scanline_fill(face_vertices, final_color, canvas.draw, canvas.z_buffer)
-
-            # 2. Draw the edges on top
+                face_vertices = [projected_vertices[j] for j in faces[i]]
+                if translucent:
+                    # Depth tested against opaque geometry but not written, so faces behind show through
+                    blend_face(face_vertices, face_colours[i], alpha, canvas.blend_buffer(), canvas.z_buffer, subpixel_bits)
+                    continue
+                if deferred:
+                    pixel_writes += fill_face(face_vertices, None, None, canvas.z_buffer, canvas.visibility.ids, (object_id, i),
+                                              subpixel_bits=subpixel_bits)
+                else:
+                    pixel_writes += fill_face(face_vertices, face_colours[i], canvas.draw, canvas.z_buffer, subpixel_bits=subpixel_bits)
+                if debug:
+                    drawn_faces.append((config_rank[id(obj)], i, face_vertices))
+
+            # 3. Draw the edges on top
             if 'edges' in obj and 'edge_color' in obj:
                 try:
                     edge_material_name = obj['edge_color']
                     edge_material = scene.materials[edge_material_name]
                     edge_color = Colour(*edge_material['color'])
                     
+                    edge_target = CoverageCollector(canvas.clip_rect) if translucent else canvas.draw
                     for edge in obj['edges']:
                         p1 = projected_vertices[edge[0]]
                         p2 = projected_vertices[edge[1]]
-                        draw_line_bresenham(p1.x, p1.y, p2.x, p2.y, edge_color, canvas.draw)
+                        segment = clip_line(p1.x, p1.y, p2.x, p2.y, canvas.clip_rect, clip_stats)
+                        if segment and deferred and not translucent:
+                            deferred_edges.append((segment, edge_color, object_id))
+                        elif segment:
+                            draw_clipped_line(segment, edge_color, edge_target)
+                    if translucent:
+                        blend_pixels(canvas.blend_buffer(), *edge_target.pixels(), edge_color, material_opacity(edge_material))
                 except KeyError:
                     # Silently fail if edge material is missing
                     pass
 
-    output_path = os.path.join("outputs", "rendered_scene.png")
-    canvas.save(output_path)
-    canvas.show()
+        if translucent and not is_3d(obj):
+            blend_pixels(canvas.blend_buffer(), *draw_target.pixels(), color, alpha)
+
+    canvas.flush_blend()
+    if deferred:
+        resolve_deferred(canvas, deferred_edges, ambient_light, directional_light)
+        if visibility_path:
+            canvas.visibility.export(visibility_path)
+    if debug and drawn_faces:
+        # Replay the same faces depth-only in config order to measure what sorting saved
+        reference_faces = [face for _, _, face in sorted(drawn_faces, key=lambda f: (f[0], f[1]))]
+        reference_writes = count_depth_writes(reference_faces, canvas.z_buffer.shape, subpixel_bits)
+        print_overdraw_report(pixel_writes, reference_writes, int(np.isfinite(canvas.z_buffer).sum()))
+    if debug:
+        clip_stats.print_report()
+        if 'src.raster.triangulate' in sys.modules:
+            stats = sys.modules['src.raster.triangulate'].cache_stats
+            print(f"Triangulation cache: {stats['hits']} hits, {stats['misses']} misses")
+        if use_stamps:
+            stamp_cache.print_report()
+        if deferred:
+            canvas.visibility.print_report()
+
+    if output_path:
+        canvas.save(output_path, compress_level)
+    if show:
+        canvas.show()
+    return canvas
+
+def render_frames(scene, frame_count, orbit, sink_args, objects_to_render=None, encoder_mode='thread', queue_size=2):
+    """
+    Renders `frame_count` frames while the camera orbits the target by `orbit` degrees
+    in total. Finished frames are encoded in the background, so frame N+1 renders
+    while frame N is being compressed or written.
+    """
+    from src.output import FrameEncoder, print_throughput_report
+
+    start_position = scene.camera.position
+    encoder = FrameEncoder(sink_args, queue_size, encoder_mode)
+    render_time = 0.0
+    try:
+        for i in range(frame_count):
+            start = time.perf_counter()
+            scene.camera.position = scene.camera.get_orbit_position(orbit * i / frame_count, start_position)
+            canvas = render_scene(scene, objects_to_render, output_path=None, show=False)
+            frame = canvas.to_array()
+            render_time += time.perf_counter() - start
+            encoder.submit(frame)
+    finally:
+        scene.camera.position = start_position
+        encoder.close()
+    print_throughput_report(frame_count, render_time, encoder)
+
+def check_kernels(scene, objects_to_render=None):
+    """
+    Renders the scene once with every available kernel backend and checks that all
+    of them produce exactly the same pixels. Returns False on any difference.
+    """
+    from src.raster import kernels
+    backends = kernels.available_backends()
+    print(f"Kernel backends available: {', '.join(backends)} (missing: {', '.join(sorted(set(kernels.BACKENDS) - set(backends))) or 'none'})")
+    original = scene.renderer_options.get('kernel_backend')
+    reference = None
+    ok = True
+    try:
+        for name in backends:
+            scene.renderer_options['kernel_backend'] = name
+            render_scene(scene, objects_to_render, output_path=None, show=False)  # warm-up (JIT compilation)
+            start = time.perf_counter()
+            pixels = render_scene(scene, objects_to_render, output_path=None, show=False).to_array()
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference = pixels
+                result = "reference"
+            else:
+                differing = int((pixels != reference).any(axis=-1).sum())
+                result = "identical" if differing == 0 else f"{differing} pixels differ"
+                ok = ok and differing == 0
+            print(f"  - {name}: {elapsed * 1000:.0f} ms, {result}")
+    finally:
+        if original is None:
+            scene.renderer_options.pop('kernel_backend', None)
+        else:
+            scene.renderer_options['kernel_backend'] = original
+    return ok
 
 def main():
     """Main function to parse arguments and render the scene."""
+    import argparse
+    from src.raster import kernels
     parser = argparse.ArgumentParser(description="Render a scene from a config file.")
     parser.add_argument('--render', nargs='*', help='A list of object names to render.')
     parser.add_argument('--debug', action='store_true', help='Enable debug printing.')
     parser.add_argument('--bb', action='store_true', help='Draw bounding boxes.')
+    parser.add_argument('--config', default="inputs/config.yaml", help='The scene config file.')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help='Where to save the rendered image.')
+    parser.add_argument('--no-show', action='store_true', help='Do not open the rendered image in a viewer.')
+    parser.add_argument('--compress-level', type=int, choices=range(10), metavar='0-9',
+                        help='PNG compression level (0 = none, 9 = smallest; Pillow default is 6).')
+    parser.add_argument('--visibility-buffer', metavar='PATH',
+                        help='Render 3D objects in deferred mode and save the (object id, face id) buffer to a .npz file.')
+    parser.add_argument('--frames', type=int, default=0,
+                        help='Render this many frames with the camera orbiting the target, encoding in the background.')
+    parser.add_argument('--orbit', type=float, default=360, help='Total camera orbit in degrees over all frames.')
+    parser.add_argument('--sink', choices=['png', 'raw', 'y4m', 'npy'], default='png',
+                        help="Frame output: numbered PNGs (--output is a pattern like 'frame_%%04d.png'), "
+                             "raw RGB24, a Y4M stream, or one .npy stack. Use --output - for stdout.")
+    parser.add_argument('--fps', type=int, default=25, help='Frame rate written to Y4M streams.')
+    parser.add_argument('--encoder', choices=['thread', 'process'], default='thread',
+                        help='Run the background encoder in a thread or a separate process.')
+    parser.add_argument('--queue-size', type=int, default=2, help='Frames that may wait for the encoder before rendering blocks.')
+    parser.add_argument('--kernels', choices=('auto',) + kernels.BACKENDS,
+                        help="Rasterizer kernel backend, overriding the config's kernel_backend (default: auto).")
+    parser.add_argument('--check-kernels', action='store_true',
+                        help='Render with every available kernel backend, check the pixels are identical, and exit.')
+    parser.add_argument('--golden', action='store_true',
+                        help='Render the golden-image corpus with every kernel backend, diff it against the stored goldens and time it.')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Re-render the golden images (except the pinned baseline) with the reference (python) kernels.')
+    parser.add_argument('--golden-report', metavar='PATH', help='With --golden, also save the results and timings as JSON.')
+    parser.add_argument('--import-budget', nargs='?', type=float, const=-1, metavar='MS',
+                        help='Check the cold-start import time of this script against a budget (in ms) and exit.')
     args = parser.parse_args()
 
+    if args.import_budget is not None:
+        from src.startup import check_import_budget, IMPORT_BUDGET_MS
+        budget = IMPORT_BUDGET_MS if args.import_budget < 0 else args.import_budget
+        sys.exit(0 if check_import_budget('main', budget) else 1)
+
     create_directories(DIRECTORIES_TO_CREATE)
     
     try:
-        scene = Scene("inputs/config.yaml")
-        render_scene(scene, args.render, args.debug, args.bb)
+        scene = Scene(args.config)
+        if args.kernels:
+            scene.renderer_options['kernel_backend'] = args.kernels
+        if args.check_kernels:
+            sys.exit(0 if check_kernels(scene, args.render) else 1)
+        if args.golden or args.update_golden:
+            from src.golden import check_goldens, update_goldens
+            render = lambda scene, objects: render_scene(scene, objects, output_path=None, show=False).to_array()
+            if args.update_golden:
+                update_goldens(Scene, render)
+            if args.golden:
+                sys.exit(0 if check_goldens(Scene, render, report_path=args.golden_report) else 1)
+            return
+        if args.frames > 0:
+            output = args.output
+            if output == DEFAULT_OUTPUT_PATH:
+                output = os.path.join("outputs", "frame_%04d.png" if args.sink == 'png' else f"frames.{args.sink}")
+            elif args.sink == 'png':
+                from src.output import png_pattern
+                output = png_pattern(output)
+            compress_level = 6 if args.compress_level is None else args.compress_level
+            sink_args = (args.sink, output, args.frames, args.fps, compress_level)
+            render_frames(scene, args.frames, args.orbit, sink_args, args.render, args.encoder, args.queue_size)
+        else:
+            render_scene(scene, args.render, args.debug, args.bb, args.output, not args.no_show, args.compress_level,
+                         args.visibility_buffer)
     except (ValueError, FileNotFoundError) as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -24,6 +24,20 @@ class Camera:
         # Orthographic properties
         self.ortho_bounds = ortho_bounds # Should be [left, right, bottom, top]
 
+    def get_orbit_position(self, angle_degrees, position=None):
+        """
+        Returns `position` (the camera position by default) rotated about the target
+        around the up axis. Pass a fixed start position when orbiting over several
+        frames, so the angle does not accumulate.
+        """
+        angle = np.radians(angle_degrees)
+        offset = (self.position if position is None else np.asarray(position, dtype=float)) - self.target
+        axis = self.up
+        # Rodrigues' rotation formula
+        rotated = (offset * np.cos(angle) + np.cross(axis, offset) * np.sin(angle)
+                   + axis * np.dot(axis, offset) * (1 - np.cos(angle)))
+        return self.target + rotated
+
     def get_view_matrix(self):
         # Create a coordinate system for the camera
         forward = normalize(self.target - self.position)
@@ -49,6 +63,25 @@ class Camera:
         # The view matrix is the combination of translation and rotation
         return np.dot(rotation, translation)
 
+    def get_projected_radius(self, center, radius, viewport_height, projection_type='perspective'):
+        """
+        Estimates the on-screen radius in pixels of a world-space sphere.
+        `center` may be a single point or an (N, 3|4) array of points; spheres that
+        reach the camera plane return infinity.
+        """
+        if projection_type == 'orthographic':
+            if self.ortho_bounds:
+                bottom, top = self.ortho_bounds[2], self.ortho_bounds[3]
+            else:
+                bottom, top = -10, 10
+            return radius * viewport_height / (top - bottom) + np.zeros(np.shape(center)[:-1])
+
+        forward = normalize(self.target - self.position)
+        distance = np.dot(np.asarray(center, dtype=float)[..., :3] - self.position, forward)
+        f = 1.0 / np.tan(np.radians(self.fov) / 2)
+        safe_distance = np.where(distance > radius, distance, 1)
+        return np.where(distance > radius, radius * f * 0.5 * viewport_height / safe_distance, np.inf)
+
     def get_projection_matrix(self, projection_type='perspective'):
         if projection_type == 'perspective':
             f = 1.0 / np.tan(np.radians(self.fov) / 2)
@@ -76,3 +109,22 @@ class Camera:
             ])
         else:
             return np.identity(4)
+
+def frustum_planes(view_projection_matrix, include_far=True):
+    """
+    Extracts the world-space clipping planes of a view-projection matrix
+    (Gribb-Hartmann). Each row is a plane (a, b, c, d) with its normal pointing
+    into the frustum, so a point is inside when a*x + b*y + c*z + d >= 0.
+    """
+    m = view_projection_matrix
+    planes = [
+        m[3] + m[0],  # left
+        m[3] - m[0],  # right
+        m[3] + m[1],  # bottom
+        m[3] - m[1],  # top
+        m[3] + m[2],  # near
+    ]
+    if include_far:
+        planes.append(m[3] - m[2])
+    planes = np.array(planes, dtype=float)
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
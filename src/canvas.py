@@ -1,30 +1,65 @@
 import numpy as np
-from PIL import Image, ImageDraw
 
 class Canvas:
     def __init__(self, width, height, bg_color=(255, 255, 255)):
+        # Imported here so modules that only need the geometry helpers do not load PIL
+        from PIL import Image, ImageDraw
         self.width = width
         self.height = height
         self.bg_color = bg_color
         self.image = Image.new("RGB", (self.width, self.height), self.bg_color)
         self.draw = ImageDraw.Draw(self.image)
+        # Inclusive pixel bounds that 2D primitives are clipped to before rasterizing
+        self.clip_rect = (0, 0, self.width - 1, self.height - 1)
         
         # Initialize the Z-buffer with a large value (representing infinity)
         self.z_buffer = np.full((self.width, self.height), np.inf, dtype=np.float32)
+        # (object id, face id) per pixel, only kept when 3D objects are shaded deferred
+        self.visibility = None
+        # Float (height, width, 3) copy of the image that translucent shapes are composited into
+        self.blend = None
 
-    def save(self, output_path):
-        self.image.save(output_path)
+    def blend_buffer(self):
+        """Returns the float accumulation buffer for translucent drawing, copying the image into it if needed."""
+        if self.blend is None:
+            self.blend = np.asarray(self.image, dtype=np.float32).copy()
+        return self.blend
+
+    def flush_blend(self):
+        """Writes the accumulation buffer back into the image, so opaque drawing can continue on top."""
+        if self.blend is None:
+            return
+        from PIL import Image
+        self.image.paste(Image.fromarray(np.rint(self.blend).astype(np.uint8)))
+        self.blend = None
+
+    def save(self, output_path, compress_level=None):
+        self.flush_blend()
+        # compress_level (0-9) only applies to PNG; None keeps Pillow's default
+        options = {} if compress_level is None else {'compress_level': compress_level}
+        self.image.save(output_path, **options)
         print(f"Scene saved to {output_path}")
 
     def show(self):
+        self.flush_blend()
         self.image.show()
 
+    def to_array(self):
+        """Returns the rendered pixels as a (height, width, 3) uint8 array."""
+        self.flush_blend()
+        return np.asarray(self.image)
+
     def world_to_screen(self, x, y):
         """Converts world coordinates to screen coordinates."""
         screen_x = int(x + self.width / 2)
         screen_y = int(-y + self.height / 2)
         return screen_x, screen_y
 
+    def world_to_screen_points(self, points):
+        """Converts an (N, 2) array of world coordinates to float screen coordinates (not yet truncated to pixels)."""
+        points = np.asarray(points, dtype=float)
+        return np.column_stack([points[:, 0] + self.width / 2, -points[:, 1] + self.height / 2])
+
     def draw_quadrant_boundaries(self):
         """Draws lines to represent the quadrants."""
         self.draw.line([(0, self.height / 2), (self.width, self.height / 2)], fill="black", width=1)
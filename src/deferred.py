@@ -0,0 +1,107 @@
+import numpy as np
+from src.render3d import face_intensities
+
+class VisibilityBuffer:
+    """
+    Per-pixel (object id, face id) of the nearest 3D face, for deferred shading.
+
+    The rasterizer only writes depth and ids into `ids`, a (width, height, 2) int32
+    array holding -1 where no face was drawn. `resolve` then lights each visible
+    face once and writes its colour to every pixel it covers.
+    """
+    def __init__(self, width, height):
+        self.ids = np.full((width, height, 2), -1, dtype=np.int32)
+        self.names = []
+        self.normals = []
+        self.colours = []
+        self.resolved = 0 # objects whose pixels have already been shaded
+        self.faces_total = 0
+        self.faces_shaded = 0
+
+    def add_object(self, name, normals, colour):
+        """Registers an object's world-space face normals and base Colour, and returns its id."""
+        self.names.append(name)
+        self.normals.append(np.asarray(normals, dtype=float).reshape(-1, 3))
+        self.colours.append(colour.to_tuple())
+        self.faces_total += len(self.normals[-1])
+        return len(self.names) - 1
+
+    def pending(self):
+        return self.resolved < len(self.names)
+
+    def resolve(self, image, ambient_light, directional_light):
+        """
+        Flat-shades every face visible among the objects added since the last call
+        and writes the colours into the Pillow `image`. Returns the pixels written.
+        """
+        first = self.resolved
+        self.resolved = len(self.names)
+        xs, ys = np.nonzero(self.ids[..., 0] >= first)
+        if len(xs) == 0:
+            return 0
+
+        # Light each visible face once, for all objects in one go
+        object_ids = self.ids[xs, ys, 0].astype(np.int64)
+        face_ids = self.ids[xs, ys, 1].astype(np.int64)
+        stride = int(face_ids.max()) + 1
+        visible, pixel_face = np.unique(object_ids * stride + face_ids, return_inverse=True)
+        visible_objects, visible_faces = np.divmod(visible, stride)
+        base = np.array(self.colours, dtype=float)[visible_objects]
+        if directional_light:
+            normals = np.empty((len(visible), 3))
+            for object_id in np.unique(visible_objects):
+                selected = visible_objects == object_id
+                normals[selected] = self.normals[object_id][visible_faces[selected]]
+            rgb = np.minimum(255, base * face_intensities(normals, ambient_light, directional_light)[:, None])
+        else:
+            rgb = base
+        self.faces_shaded += len(visible)
+
+        # Write the shaded pixels back through their bounding box
+        from PIL import Image
+        x0, y0, x1, y1 = xs.min(), ys.min(), xs.max(), ys.max()
+        region = np.array(image.crop((x0, y0, x1 + 1, y1 + 1)))
+        region[ys - y0, xs - x0] = rgb.astype(np.uint8)[pixel_face]
+        image.paste(Image.fromarray(region), (int(x0), int(y0)))
+        return len(xs)
+
+    def edge_draw(self, draw, object_id):
+        """
+        Wraps an ImageDraw so that an object's edges, drawn after deferred shading,
+        skip pixels later objects won, as they would be painted over in forward mode.
+        """
+        return _OccludedDraw(draw, self.ids, object_id)
+
+    def pick(self, x, y):
+        """Returns (object name, face index) of the face visible at screen pixel (x, y), or None."""
+        object_id, face_id = self.ids[x, y]
+        if object_id < 0:
+            return None
+        return self.names[object_id], int(face_id)
+
+    def export(self, path):
+        """
+        Saves the buffer to a `.npz` file with (height, width) `object_ids` and
+        `face_ids` arrays in image layout, and the object `names` they index.
+        """
+        np.savez_compressed(path, object_ids=self.ids[..., 0].T, face_ids=self.ids[..., 1].T,
+                            names=np.array(self.names, dtype=str))
+        print(f"Visibility buffer saved to {path}")
+
+    def print_report(self):
+        print(f"Deferred shading: {self.faces_shaded} visible faces shaded of {self.faces_total} "
+              f"in {len(self.names)} objects")
+
+class _OccludedDraw:
+    """An ImageDraw stand-in whose `point` only draws where no later object is visible."""
+    def __init__(self, draw, ids, object_id):
+        self.draw = draw
+        self.ids = ids
+        self.object_id = object_id
+
+    def point(self, xy, fill=None):
+        # `xy` is one (x, y) pair or a flat [x0, y0, x1, y1, ...] list, like ImageDraw.point
+        pixels = np.asarray(xy, dtype=np.int64).reshape(-1, 2)
+        keep = self.ids[pixels[:, 0], pixels[:, 1], 0] <= self.object_id
+        if keep.any():
+            self.draw.point(pixels[keep].ravel().tolist(), fill=fill)
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 
 def generate_sphere_mesh(radius=1.0, sectors=36, stacks=18):
     """
@@ -57,3 +58,46 @@ def generate_sphere_mesh(radius=1.0, sectors=36, stacks=18):
             k2 += 1
 
     return vertices, faces
+
+def generate_cube_vertices(center, size):
+    """
+    Generates the 8 corner vertices of an axis-aligned cube.
+
+    Args:
+        center (list): The [x, y, z] center of the cube.
+        size (float): The side length of the cube.
+
+    Returns:
+        list: A list of vertex coordinates [x, y, z, 1.0]. Indices 0-3 are the
+              back face (-z) and 4-7 the front face (+z), as used by the
+              `faces` and `edges` lists in config.yaml.
+    """
+    s = size / 2
+    return [
+        [center[0] - s, center[1] - s, center[2] - s, 1.0],
+        [center[0] + s, center[1] - s, center[2] - s, 1.0],
+        [center[0] + s, center[1] + s, center[2] - s, 1.0],
+        [center[0] - s, center[1] + s, center[2] - s, 1.0],
+        [center[0] - s, center[1] - s, center[2] + s, 1.0],
+        [center[0] + s, center[1] - s, center[2] + s, 1.0],
+        [center[0] + s, center[1] + s, center[2] + s, 1.0],
+        [center[0] - s, center[1] + s, center[2] + s, 1.0],
+    ]
+
+@lru_cache(maxsize=None)
+def unit_sphere_mesh(sectors, stacks):
+    """
+    Returns a cached unit-radius sphere as NumPy arrays, so each tessellation level
+    is generated only once per run. The arrays are read-only; scale a copy.
+
+    Returns:
+        tuple: A tuple containing:
+            - np.ndarray: An (N, 4) array of homogeneous vertices.
+            - np.ndarray: An (F, 4) array of quad faces.
+    """
+    vertices, faces = generate_sphere_mesh(1.0, sectors, stacks)
+    vertices = np.array(vertices, dtype=float)
+    faces = np.array(faces, dtype=np.int64)
+    vertices.flags.writeable = False
+    faces.flags.writeable = False
+    return vertices, faces
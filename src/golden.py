@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from collections import namedtuple
+import numpy as np
+
+from src.raster import kernels
+from src.render3d import OBJECT_TYPES_3D
+
+# Golden-image harness: renders a fixed corpus of scenes, built from frozen configs
+# in GOLDEN_DIR (not the user's inputs/config.yaml), through every available kernel
+# backend and diffs each result against a stored PNG. The goldens are rendered with
+# the plain-Python reference kernels, except pinned ones: BASELINE_CONFIG's golden is
+# the original renderer's output, and is never re-rendered.
+GOLDEN_DIR = os.path.join('inputs', 'golden')
+CORPUS_CONFIG = os.path.join(GOLDEN_DIR, 'corpus.yaml')
+SHIPPED_CONFIG = os.path.join(GOLDEN_DIR, 'shipped.yaml')
+BASELINE_CONFIG = os.path.join(GOLDEN_DIR, 'baseline.yaml')
+REFERENCE_BACKEND = 'python'
+
+# What the original renderer did: vertices truncated to whole pixels, full
+# tessellation, config order and no stamp cache
+BASELINE_OPTIONS = {'subpixel_bits': 0, 'sphere_lod': False, 'sort_objects': False, 'sort_faces': False,
+                    'stamp_cache': False, 'deferred': False}
+
+# A pixel matches when every channel is within CHANNEL_TOLERANCE of the golden one,
+# and a render passes when at most PIXEL_TOLERANCE (a fraction) of its pixels do not.
+# The backends are exact, so both default to 0; a case may loosen them.
+CHANNEL_TOLERANCE = 0
+PIXEL_TOLERANCE = 0.0
+
+# `types` selects objects of the case's `config` scene by type (None keeps them all)
+# and `options` overrides renderer options. Cases that take a different path to the
+# same pixels (stamps, deferred shading) are checked against another case's golden.
+# A `pinned` golden is never re-rendered by `update_goldens`.
+GoldenCase = namedtuple('GoldenCase', ['name', 'types', 'options', 'golden', 'channel_tolerance', 'pixel_tolerance',
+                                       'config', 'pinned'],
+                        defaults=(None, {}, None, CHANNEL_TOLERANCE, PIXEL_TOLERANCE, CORPUS_CONFIG, False))
+
+CORPUS = (
+    GoldenCase('scene'),
+    GoldenCase('lines', ('line',)),
+    GoldenCase('circles', ('circle',), {'stamp_cache': False}),
+    GoldenCase('circle_stamps', ('circle',), {'stamp_cache': True}, golden='circles'),
+    GoldenCase('triangles', ('triangle',)),
+    GoldenCase('polygons', ('polygon',), {'stamp_cache': False}),
+    GoldenCase('polygon_stamps', ('polygon',), {'stamp_cache': True}, golden='polygons'),
+    GoldenCase('paths', ('path',), {'stamp_cache': False}),
+    GoldenCase('path_stamps', ('path',), {'stamp_cache': True}, golden='paths'),
+    GoldenCase('meshes', OBJECT_TYPES_3D, {'deferred': False}),
+    GoldenCase('deferred', OBJECT_TYPES_3D, {'deferred': True}, golden='meshes'),
+    GoldenCase('meshes_integer', OBJECT_TYPES_3D, {'deferred': False, 'subpixel_bits': 0}),
+    GoldenCase('shipped', config=SHIPPED_CONFIG),
+    GoldenCase('baseline', options=BASELINE_OPTIONS, config=BASELINE_CONFIG, pinned=True),
+)
+
+def golden_path(case, golden_dir=GOLDEN_DIR):
+    return os.path.join(golden_dir, f"{case.golden or case.name}.png")
+
+def compare_images(pixels, golden, channel_tolerance=CHANNEL_TOLERANCE, pixel_tolerance=PIXEL_TOLERANCE):
+    """
+    Diffs two (height, width, 3) uint8 arrays.
+
+    Returns:
+        dict: `differing_pixels` (pixels with a channel off by more than the tolerance),
+              `max_channel_diff` and whether the render `passed`.
+    """
+    if pixels.shape != golden.shape:
+        return {'differing_pixels': None, 'max_channel_diff': None, 'passed': False}
+    diff = np.abs(pixels.astype(np.int16) - golden.astype(np.int16))
+    differing = int((diff > channel_tolerance).any(axis=-1).sum())
+    return {
+        'differing_pixels': differing,
+        'max_channel_diff': int(diff.max()) if diff.size else 0,
+        'passed': differing <= pixel_tolerance * diff.shape[0] * diff.shape[1],
+    }
+
+def _render_case(scene, case, render, backend):
+    """Renders one corpus case with the given kernel backend, restoring the scene's options afterwards."""
+    saved = dict(scene.renderer_options)
+    scene.renderer_options.update(case.options, kernel_backend=backend)
+    try:
+        objects = None
+        if case.types is not None:
+            objects = [obj['name'] for obj in scene.objects if obj['type'] in case.types]
+        return render(scene, objects)
+    finally:
+        scene.renderer_options.clear()
+        scene.renderer_options.update(saved)
+
+def _case_scenes(load_scene):
+    """Returns a function giving each case's scene, loading every config once."""
+    scenes = {}
+    def scene_for(case):
+        if case.config not in scenes:
+            scenes[case.config] = load_scene(case.config)
+        return scenes[case.config]
+    return scene_for
+
+def update_goldens(load_scene, render, golden_dir=GOLDEN_DIR):
+    """
+    Re-renders every golden image that is not pinned with the reference backend.
+    Only run it in a change that says why the images differ.
+
+    `load_scene(config_path)` must return the Scene for a case's config.
+    """
+    from PIL import Image
+    os.makedirs(golden_dir, exist_ok=True)
+    scene_for = _case_scenes(load_scene)
+    for case in CORPUS:
+        if case.golden or case.pinned:
+            continue
+        path = golden_path(case, golden_dir)
+        Image.fromarray(_render_case(scene_for(case), case, render, REFERENCE_BACKEND)).save(path)
+        print(f"Golden image saved to {path}")
+
+def check_goldens(load_scene, render, repeats=3, report_path=None, golden_dir=GOLDEN_DIR):
+    """
+    Renders every corpus case with every available backend, timing the best of
+    `repeats` warm runs, and diffs the result against its golden image. Prints a
+    table and optionally writes it to `report_path` as JSON. Returns False if any
+    render fails its tolerance or a golden image is missing.
+
+    `load_scene(config_path)` must return the Scene for a case's config, and
+    `render(scene, object_names)` the rendered (height, width, 3) pixels.
+    """
+    from PIL import Image
+    backends = kernels.available_backends()
+    print(f"Golden images in {golden_dir}, backends: {', '.join(backends)}")
+    scene_for = _case_scenes(load_scene)
+    report = {}
+    ok = True
+    for case in CORPUS:
+        scene = scene_for(case)
+        path = golden_path(case, golden_dir)
+        if not os.path.exists(path):
+            print(f"  {case.name}: missing golden image {path} (run with --update-golden)")
+            ok = False
+            continue
+        golden = np.asarray(Image.open(path).convert('RGB'))
+        report[case.name] = {}
+        for backend in backends:
+            _render_case(scene, case, render, backend)  # warm-up (JIT compilation, caches)
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                pixels = _render_case(scene, case, render, backend)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result = compare_images(pixels, golden, case.channel_tolerance, case.pixel_tolerance)
+            result['ms'] = round(best * 1000, 1)
+            report[case.name][backend] = result
+            ok = ok and result['passed']
+            if result['differing_pixels'] is None:
+                verdict = f"FAIL (size {pixels.shape[1]}x{pixels.shape[0]}, golden {golden.shape[1]}x{golden.shape[0]})"
+            elif result['differing_pixels'] == 0:
+                verdict = "identical"
+            else:
+                verdict = (f"{'ok' if result['passed'] else 'FAIL'} ({result['differing_pixels']} pixels differ, "
+                           f"max channel diff {result['max_channel_diff']})")
+            print(f"  {case.name:<16} {backend:<7} {result['ms']:>8.1f} ms  {verdict}")
+
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Golden report saved to {report_path}")
+    return ok
@@ -1,5 +1,4 @@
 import os
-import yaml
 
 class Point:
     def __init__(self, x, y):
@@ -16,6 +15,17 @@ class Colour:
         """Returns the color as an (r, g, b) tuple."""
         return (self.r, self.g, self.b)
 
+def material_opacity(material):
+    """Returns a material's `opacity` (1 = opaque, the default; 0 = invisible)."""
+    opacity = float(material.get('opacity', 1.0))
+    if not 0 <= opacity <= 1:
+        raise ValueError(f"Material opacity must be between 0 and 1, got {opacity}.")
+    return opacity
+
+def object_opacity(obj, materials):
+    """Returns the opacity of an object's material, or 1 if it has none (it is skipped later)."""
+    return material_opacity(materials.get(obj.get('material'), {}))
+
 def create_directories(dirs_to_create):
     """Creates the necessary directories for the project."""
     for directory in dirs_to_create:
@@ -30,6 +40,7 @@ def create_directories(dirs_to_create):
 
 def load_config(config_path):
     """Loads the YAML configuration file."""
+    import yaml  # Only needed when the scene comes from a file
     try:
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
@@ -81,6 +92,11 @@ def draw_bounding_box(obj, canvas):
         start = canvas.world_to_screen(obj['start'][0], obj['start'][1])
         end = canvas.world_to_screen(obj['end'][0], obj['end'][1])
         draw.rectangle([min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1])], outline="green")
+    elif obj['type'] == 'path':
+        # The box of the control points, which always contains the curve
+        from src.raster.bezier import path_cubics
+        verts = [canvas.world_to_screen(v[0], v[1]) for v in path_cubics(obj['start'], obj['segments']).reshape(-1, 2)]
+        draw.rectangle([min(v[0] for v in verts), min(v[1] for v in verts), max(v[0] for v in verts), max(v[1] for v in verts)], outline="green")
 
 def write_debug_info(obj_name, obj_data, canvas, y_offset):
     """Draws debug information for a given object on the image."""
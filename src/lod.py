@@ -0,0 +1,46 @@
+import numpy as np
+
+# Tessellation levels (sectors, stacks) for spheres, coarsest first. Stacks are
+# half the sectors so the angular step is the same in both directions.
+SPHERE_LOD_LEVELS = ((6, 3), (8, 4), (12, 6), (18, 9), (24, 12), (36, 18), (48, 24), (64, 32))
+
+DEFAULT_LOD_TOLERANCE = 0.5 # pixels
+
+def sphere_tessellation_error(screen_radius, sectors):
+    """
+    Returns the largest gap in pixels between a sphere's silhouette and its
+    tessellation: the sagitta of one sector's chord, R * (1 - cos(pi / sectors)).
+    """
+    return screen_radius * (1 - np.cos(np.pi / sectors))
+
+def select_sphere_level(screen_radius, tolerance, max_sectors, max_stacks):
+    """
+    Picks the coarsest tessellation whose silhouette error stays within `tolerance`
+    pixels. The object's configured sectors/stacks are the most detail it can get.
+    """
+    for sectors, stacks in SPHERE_LOD_LEVELS:
+        if sectors > max_sectors:
+            break
+        if sphere_tessellation_error(screen_radius, sectors) <= tolerance:
+            return sectors, min(stacks, max_stacks)
+    return max_sectors, max_stacks
+
+def max_axis_scale(model_matrices):
+    """Returns the largest axis scale of one (4, 4) or a stack of (I, 4, 4) model matrices."""
+    return np.linalg.norm(np.asarray(model_matrices)[..., :3, :3], axis=-2).max(axis=-1)
+
+def sphere_lod(sphere, model_matrices, camera, projection_type, viewport_height, tolerance=DEFAULT_LOD_TOLERANCE):
+    """
+    Chooses the sphere tessellation for the given model matrix (or the nearest of a
+    stack of instance matrices) from its projected screen radius.
+
+    Returns:
+        tuple: (sectors, stacks, screen_radius)
+    """
+    model_matrices = np.asarray(model_matrices).reshape(-1, 4, 4)
+    centers = np.dot(model_matrices, np.array([0, 0, 0, 1.0]))
+    radii = sphere.get('radius', 1) * max_axis_scale(model_matrices)
+    screen_radius = float(np.max(camera.get_projected_radius(centers, radii, viewport_height, projection_type)))
+    tolerance = sphere.get('lod_tolerance', tolerance)
+    sectors, stacks = select_sphere_level(screen_radius, tolerance, sphere.get('sectors', 36), sphere.get('stacks', 18))
+    return sectors, stacks, screen_radius
@@ -0,0 +1,240 @@
+import os
+import re
+import hashlib
+import numpy as np
+
+CACHE_DIR_NAME = ".mesh_cache"
+# Part of the cache key; bump it when parsing changes so stale caches are not reused
+CACHE_VERSION = 3
+
+# Tabs, carriage returns and other blanks inside OBJ records are treated as spaces
+_WHITESPACE_TO_SPACE = bytes.maketrans(b'\t\r\v\f', b'    ')
+
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8',
+}
+
+def load_mesh(path, cache_dir=None):
+    """
+    Loads an OBJ or binary PLY model as NumPy arrays.
+
+    The first load parses the file and writes a cached `.npy` copy; later loads
+    memory-map that copy read-only, so startup does not depend on model size and
+    several worker processes share the same pages.
+
+    Args:
+        path (str): Path to a `.obj` or `.ply` file.
+        cache_dir (str): Where to keep the cache. Defaults to a `.mesh_cache`
+                         directory next to the model.
+
+    Returns:
+        tuple: A tuple containing:
+            - np.ndarray: An (N, 4) float32 array of homogeneous vertices.
+            - np.ndarray: An (F, 3) int32 array of triangle vertex indices.
+    """
+    vertices_path, faces_path = cache_paths(path, cache_dir)
+    if not (os.path.exists(vertices_path) and os.path.exists(faces_path)):
+        vertices, faces = parse_mesh(path)
+        homogeneous = np.ones((len(vertices), 4), dtype=np.float32)
+        homogeneous[:, :3] = vertices
+        os.makedirs(os.path.dirname(vertices_path), exist_ok=True)
+        _save_atomic(faces_path, faces.astype(np.int32))
+        _save_atomic(vertices_path, homogeneous)
+    return np.load(vertices_path, mmap_mode='r'), np.load(faces_path, mmap_mode='r')
+
+def cache_paths(path, cache_dir=None):
+    """Returns the vertex and face cache files for a model. The key changes whenever the file does."""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{CACHE_VERSION}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(cache_dir, f"{stem}-{digest}")
+    return base + ".vertices.npy", base + ".faces.npy"
+
+def _save_atomic(path, array):
+    # Write to a temporary name first so a concurrent reader never maps a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def parse_mesh(path):
+    """Parses a model file into (N, 3) vertices and (F, 3) triangles based on its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.obj':
+        return parse_obj(path)
+    if ext == '.ply':
+        return parse_ply(path)
+    raise ValueError(f"Unsupported mesh format '{ext}' for '{path}'. Use .obj or .ply.")
+
+def fan_triangulate(starts, counts, indices):
+    """
+    Splits polygons stored back to back in `indices` into triangle fans
+    (0, k, k + 1) with one gather. Triangles keep the order of their polygons,
+    so face ids follow the file; polygons with fewer than 3 corners are dropped.
+    """
+    fans = np.maximum(counts - 2, 0)
+    owner = np.repeat(np.arange(len(counts)), fans)
+    k = np.arange(int(fans.sum())) - np.repeat(np.cumsum(fans) - fans, fans) + 1
+    first = np.asarray(starts, dtype=np.int64)[owner]
+    return indices[np.stack([first, first + k, first + k + 1], axis=-1)].reshape(-1, 3)
+
+def _line_token_counts(block, lines):
+    """Returns the number of space-separated tokens on each of the `lines` lines of `block`."""
+    chars = np.frombuffer(block, dtype=np.uint8)
+    newline = chars == ord('\n')
+    blank = newline | (chars == ord(' '))
+    # A token starts at a non-blank byte that follows a blank one (or the start of the block)
+    starts = np.flatnonzero(~blank & np.concatenate([[True], blank[:-1]]))
+    return np.bincount(np.searchsorted(np.flatnonzero(newline), starts), minlength=lines).astype(np.int64)
+
+def parse_obj(path):
+    """
+    Parses the `v` and `f` records of a Wavefront OBJ file. Texture and normal
+    indices are ignored and polygons are fan-triangulated in file order. Negative
+    (relative) indices count back from the last vertex defined before their face,
+    as the OBJ format specifies. Inline `#` comments are ignored and fields may be
+    separated by any mix of spaces and tabs.
+
+    Records are split out with regular expressions and every number is parsed
+    with a single NumPy call; nothing loops over lines in Python.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    data = re.sub(rb'#[^\n]*', b'', data).translate(_WHITESPACE_TO_SPACE)
+    # `v` and `f` records in file order; `vt`, `vn` and other records do not match
+    records = re.findall(rb'^ *([vf] [^\n]*)', data, re.MULTILINE)
+    is_vertex = np.array(records, dtype='S1') == b'v'
+    records = np.array(records, dtype=object)
+
+    # Numbers never contain the letters v or f, so deleting them drops just the keywords
+    v_block = b'\n'.join(records[is_vertex].tolist()).translate(None, b'v')
+    v_count = int(is_vertex.sum())
+    coords = np.fromstring(v_block.decode(), dtype=np.float64, sep=' ')
+    if len(coords) != 3 * v_count:
+        # Some lines carry an optional w component; keep x, y, z only
+        counts = _line_token_counts(v_block, v_count)
+        position = np.arange(len(coords)) - np.repeat(np.cumsum(counts) - counts, counts)
+        coords = coords[position < 3]
+    vertices = coords.reshape(-1, 3)
+
+    block = b'\n'.join(records[~is_vertex].tolist()).translate(None, b'f')
+    counts = _line_token_counts(block, len(is_vertex) - v_count)
+    # Corners look like 'v', 'v/vt', 'v//vn' or 'v/vt/vn'. When every corner has the
+    # same layout, parse all fields at once and keep every `fields`-th number.
+    fields = block.split(None, 1)[0].count(b'/') + 1 if block.strip() else 1
+    numbers = np.fromstring(block.replace(b'//', b'/0/').replace(b'/', b' ').decode(), dtype=np.int64, sep=' ')
+    if len(numbers) != counts.sum() * fields:
+        fields = 1
+        numbers = np.fromstring(re.sub(rb'/\S*', b'', block).decode(), dtype=np.int64, sep=' ')
+    indices = numbers[::fields]
+    # Number of vertices defined before each face, repeated for each of its corners
+    vertices_before = np.cumsum(is_vertex)[~is_vertex]
+    indices = np.where(indices < 0, indices + np.repeat(vertices_before, counts), indices - 1)
+    starts = np.cumsum(counts) - counts
+    return vertices, fan_triangulate(starts, counts, indices)
+
+def _read_ply_header(f):
+    if f.readline().strip() != b'ply':
+        raise ValueError("Not a PLY file.")
+    fmt = None
+    elements = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Unexpected end of PLY header.")
+        words = line.decode('ascii').split()
+        if not words or words[0] in ('comment', 'obj_info'):
+            continue
+        if words[0] == 'end_header':
+            return fmt, elements
+        if words[0] == 'format':
+            fmt = words[1]
+        elif words[0] == 'element':
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == 'property':
+            if words[1] == 'list':
+                elements[-1][2].append((words[4], 'list', PLY_TYPES[words[2]], PLY_TYPES[words[3]]))
+            else:
+                elements[-1][2].append((words[2], PLY_TYPES[words[1]]))
+
+def parse_ply(path):
+    """
+    Parses a binary (little or big endian) PLY file. Fixed-size elements are read
+    with a single structured `np.frombuffer`; the face list is read the same way
+    when every face has the same vertex count, which covers triangle meshes.
+    """
+    with open(path, 'rb') as f:
+        fmt, elements = _read_ply_header(f)
+        data = f.read()
+
+    if fmt == 'binary_little_endian':
+        order = '<'
+    elif fmt == 'binary_big_endian':
+        order = '>'
+    else:
+        raise ValueError(f"Only binary PLY files are supported, '{path}' is '{fmt}'.")
+
+    offset = 0
+    vertices = faces = None
+    for name, count, properties in elements:
+        if all(len(p) == 2 for p in properties):
+            dtype = np.dtype([(p[0], order + p[1]) for p in properties])
+            table = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += dtype.itemsize * count
+            if name == 'vertex':
+                vertices = np.stack([table['x'], table['y'], table['z']], axis=-1).astype(np.float64)
+        elif name == 'face':
+            faces, offset = _read_ply_faces(data, offset, count, properties, order)
+        else:
+            # Variable-length elements we do not need come last in practice; stop here
+            break
+        if vertices is not None and faces is not None:
+            break
+
+    if vertices is None or faces is None:
+        raise ValueError(f"PLY file '{path}' has no vertex or face element.")
+    return vertices, faces
+
+def _read_ply_faces(data, offset, count, properties, order):
+    list_props = [p for p in properties if len(p) == 4]
+    if len(list_props) != 1 or len(properties) != 1:
+        raise ValueError("PLY faces must have exactly one list property.")
+    _, _, count_type, index_type = list_props[0]
+    count_dtype = np.dtype(order + count_type)
+    index_dtype = np.dtype(order + index_type)
+
+    if count == 0:
+        return np.empty((0, 3), dtype=np.int64), offset
+
+    # Fast path: every face has as many corners as the first one
+    n = int(np.frombuffer(data, dtype=count_dtype, count=1, offset=offset)[0])
+    dtype = np.dtype([('n', count_dtype), ('i', index_dtype, (n,))])
+    if offset + dtype.itemsize * count <= len(data):
+        table = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        if np.all(table['n'] == n):
+            starts = np.arange(count) * n
+            faces = fan_triangulate(starts, np.full(count, n), table['i'].reshape(-1).astype(np.int64))
+            return faces, offset + dtype.itemsize * count
+
+    # Mixed polygon sizes: walk the records once, then triangulate vectorized
+    counts = np.empty(count, dtype=np.int64)
+    chunks = []
+    for k in range(count):
+        n = int(np.frombuffer(data, dtype=count_dtype, count=1, offset=offset)[0])
+        offset += count_dtype.itemsize
+        chunks.append(np.frombuffer(data, dtype=index_dtype, count=n, offset=offset))
+        offset += index_dtype.itemsize * n
+        counts[k] = n
+    indices = np.concatenate(chunks).astype(np.int64)
+    starts = np.cumsum(counts) - counts
+    return fan_triangulate(starts, counts, indices), offset
@@ -0,0 +1,91 @@
+import numpy as np
+
+def view_depths(view_matrix, points):
+    """
+    Returns the distance in front of the camera of each homogeneous world point.
+    The camera looks down -z in view space, so depth is the negated view z.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 4)
+    return -np.dot(points, view_matrix.T)[:, 2]
+
+def front_to_back(depths):
+    """Returns the indices that sort the given depths nearest first (stable for ties)."""
+    return np.argsort(depths, kind='stable')
+
+def order_render_list(render_list, view_matrix, is_3d, center_fn, is_translucent=None, sort_opaque=True,
+                      has_edges=None):
+    """
+    Reorders the render list so that opaque 3D objects are drawn front to back
+    (unless `sort_opaque` is False), followed by translucent 3D objects back to front.
+
+    2D objects are not depth tested, so they keep their painter's order: only
+    runs of consecutive 3D objects between two 2D objects are reordered, which
+    keeps every 2D object drawn over everything listed before it. Opaque 3D
+    objects for which `has_edges` is true keep their place among the opaque
+    objects of their run, since their edges are drawn without a depth test and
+    may only be covered by faces of objects listed after them. Translucent
+    objects always move behind every opaque object of their run, edged or not.
+    """
+    ordered = []
+    run = []
+
+    def sorted_opaque(indices, depths):
+        indices = np.asarray(indices, dtype=int)
+        return list(indices[front_to_back(depths[indices])] if sort_opaque else indices)
+
+    def flush():
+        if run:
+            depths = view_depths(view_matrix, [center_fn(obj) for obj in run])
+            translucent = np.array([bool(is_translucent and is_translucent(obj)) for obj in run])
+            # Edged objects split the opaque objects into stretches that are sorted separately
+            opaque, stretch = [], []
+            for i in np.flatnonzero(~translucent):
+                if has_edges and has_edges(run[i]):
+                    opaque += sorted_opaque(stretch, depths) + [i]
+                    stretch = []
+                else:
+                    stretch.append(i)
+            opaque += sorted_opaque(stretch, depths)
+            # Translucent objects blend over what is behind them, so the farthest goes first
+            blended = np.flatnonzero(translucent)
+            blended = blended[front_to_back(-depths[blended])]
+            ordered.extend(run[i] for i in [*opaque, *blended])
+            run.clear()
+
+    for obj in render_list:
+        if is_3d(obj):
+            run.append(obj)
+        else:
+            flush()
+            ordered.append(obj)
+    flush()
+    return ordered
+
+def face_order(view_matrix, world_vertices, faces):
+    """Returns face indices sorted front to back by the mean view depth of their vertices."""
+    if len(faces) == 0:
+        return []
+    depths = view_depths(view_matrix, world_vertices)
+    return front_to_back(depths[np.asarray(faces)].mean(axis=1))
+
+def count_depth_writes(faces, z_shape, subpixel_bits=0):
+    """
+    Runs a depth-only pass over a list of projected faces in the given order and
+    returns how many pixels pass the depth test (i.e. would have been shaded).
+    """
+    from src.raster.triangle import fill_face
+    z_buffer = np.full(z_shape, np.inf, dtype=np.float32)
+    return sum(fill_face(face, None, None, z_buffer, subpixel_bits=subpixel_bits) for face in faces)
+
+def print_overdraw_report(writes, reference_writes, covered):
+    """Prints the shaded pixel writes of the sorted order against the config order."""
+    if covered == 0:
+        print("Render ordering: no depth-tested pixels were drawn.")
+        return
+    saved = reference_writes - writes
+    percent = 100.0 * saved / reference_writes if reference_writes else 0.0
+    print("Render ordering:")
+    print(f"  - Covered pixels: {covered}")
+    print(f"  - Pixel writes (sorted): {writes}, overdraw {writes / covered:.2f}x")
+    print(f"  - Pixel writes (config order): {reference_writes}, overdraw {reference_writes / covered:.2f}x")
+    print(f"  - Overdraw reduction: {saved} writes ({percent:.1f}%)")
@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import queue
+import threading
+from collections import deque
+import numpy as np
+
+SINK_TYPES = ('png', 'raw', 'y4m', 'npy')
+
+def png_pattern(path):
+    """
+    Returns `path` as a per-frame file name pattern. A path that already holds one
+    printf-style frame number (such as 'frame_%04d.png') is kept; otherwise
+    '_%04d' is inserted before the extension.
+    """
+    try:
+        path % 0
+        return path
+    except TypeError as e:
+        if '%' in path.replace('%%', ''):
+            raise ValueError(f"Invalid frame file pattern '{path}': {e}. Use one number field such as %04d.")
+    root, extension = os.path.splitext(path)
+    return f"{root}_%04d{extension}"
+
+class PngSink:
+    """Writes every frame to its own PNG file. `path` is a pattern such as 'frame_%04d.png'."""
+    def __init__(self, path, compress_level=6):
+        self.path = path
+        self.compress_level = compress_level
+
+    def write(self, frame, index):
+        from PIL import Image
+        Image.fromarray(frame).save(self.path % index, compress_level=self.compress_level)
+
+    def close(self):
+        pass
+
+class RawSink:
+    """Appends frames as packed, uncompressed RGB24 to a file, or to stdout for '-'."""
+    def __init__(self, path):
+        self.stream = sys.stdout.buffer if path == '-' else open(path, 'wb')
+
+    def write(self, frame, index):
+        self.stream.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        self.stream.flush()
+        if self.stream is not sys.stdout.buffer:
+            self.stream.close()
+
+class Y4mSink(RawSink):
+    """
+    Streams frames as YUV4MPEG2 (4:4:4, BT.601 limited range) to a file or to
+    stdout for '-', so they can be piped straight into a video encoder.
+    """
+    def __init__(self, path, fps=25):
+        super().__init__(path)
+        self.fps = fps
+        self.header_written = False
+
+    def write(self, frame, index):
+        height, width = frame.shape[:2]
+        if not self.header_written:
+            self.stream.write(f"YUV4MPEG2 W{width} H{height} F{self.fps}:1 Ip A1:1 C444\n".encode('ascii'))
+            self.header_written = True
+        rgb = frame.astype(np.float32)
+        r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+        y = 16 + 0.257 * r + 0.504 * g + 0.098 * b
+        u = 128 - 0.148 * r - 0.291 * g + 0.439 * b
+        v = 128 + 0.439 * r - 0.368 * g - 0.071 * b
+        planes = np.clip(np.rint(np.stack([y, u, v])), 0, 255).astype(np.uint8)
+        self.stream.write(b"FRAME\n")
+        self.stream.write(planes.data)
+
+class NpySink:
+    """Stores all frames in a single (frames, height, width, 3) uint8 `.npy` file."""
+    def __init__(self, path, frame_count):
+        self.path = path
+        self.frame_count = frame_count
+        self.stack = None
+
+    def write(self, frame, index):
+        if self.stack is None:
+            self.stack = np.lib.format.open_memmap(self.path, mode='w+', dtype=np.uint8,
+                                                   shape=(self.frame_count,) + frame.shape)
+        self.stack[index] = frame
+
+    def close(self):
+        if self.stack is not None:
+            self.stack.flush()
+            del self.stack
+            self.stack = None
+
+def open_sink(kind, path, frame_count=1, fps=25, compress_level=6):
+    """Creates the frame sink named by `kind` (one of SINK_TYPES)."""
+    if kind == 'png':
+        return PngSink(path, compress_level)
+    if kind == 'raw':
+        return RawSink(path)
+    if kind == 'y4m':
+        return Y4mSink(path, fps)
+    if kind == 'npy':
+        return NpySink(path, frame_count)
+    raise ValueError(f"Unknown output sink '{kind}'. Choose one of: {', '.join(SINK_TYPES)}.")
+
+# --- Background encoding ---
+
+# The sink of the encoder process, created once by the pool initializer
+_process_sink = None
+
+def _init_process_sink(sink_args):
+    global _process_sink
+    _process_sink = open_sink(*sink_args)
+
+def _encode_in_process(frame, index):
+    start = time.perf_counter()
+    _process_sink.write(frame, index)
+    return time.perf_counter() - start
+
+def _close_process_sink():
+    _process_sink.close()
+
+class FrameEncoder:
+    """
+    Encodes finished frames in the background so the next frame can render meanwhile.
+
+    Frames go through a bounded queue of `queue_size` entries; `submit` only blocks
+    when the encoder has fallen that far behind, and the time spent blocked is
+    recorded for the throughput report. `mode` is 'thread' (Pillow and zlib release
+    the GIL while compressing) or 'process' (one worker process owning the sink).
+    """
+    def __init__(self, sink_args, queue_size=2, mode='thread'):
+        self.mode = mode
+        self.queue_size = queue_size
+        self.frames = 0
+        self.wait_time = 0.0
+        self.encode_time = 0.0
+        self.error = None
+
+        if mode == 'thread':
+            self.sink = open_sink(*sink_args)
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+        elif mode == 'process':
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(max_workers=1, initializer=_init_process_sink, initargs=(sink_args,))
+            self.pending = deque()
+        else:
+            raise ValueError(f"Unknown encoder mode '{mode}'. Use 'thread' or 'process'.")
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, index = item
+            start = time.perf_counter()
+            try:
+                if self.error is None:
+                    self.sink.write(frame, index)
+            except Exception as e:
+                self.error = e
+            self.encode_time += time.perf_counter() - start
+        try:
+            self.sink.close()
+        except Exception as e:
+            self.error = self.error or e
+
+    def submit(self, frame):
+        """Hands a (height, width, 3) uint8 frame to the encoder. The caller must not modify it afterwards."""
+        start = time.perf_counter()
+        if self.mode == 'thread':
+            if self.error is not None:
+                raise self.error
+            self.queue.put((frame, self.frames))
+        else:
+            while len(self.pending) >= self.queue_size:
+                self.encode_time += self.pending.popleft().result()
+            self.pending.append(self.pool.submit(_encode_in_process, frame, self.frames))
+        self.wait_time += time.perf_counter() - start
+        self.frames += 1
+
+    def close(self):
+        """Waits for every queued frame to be written and closes the sink."""
+        start = time.perf_counter()
+        if self.mode == 'thread':
+            self.queue.put(None)
+            self.worker.join()
+        else:
+            while self.pending:
+                self.encode_time += self.pending.popleft().result()
+            self.pool.submit(_close_process_sink).result()
+            self.pool.shutdown()
+        self.wait_time += time.perf_counter() - start
+        if self.error is not None:
+            raise self.error
+
+def print_throughput_report(frames, render_time, encoder, file=sys.stderr):
+    """Prints how the wall time of a multi-frame run split between rendering and waiting on the encoder."""
+    total = render_time + encoder.wait_time
+    if frames == 0 or total == 0:
+        return
+    print(f"Rendered {frames} frames in {total:.2f} s ({frames / total:.2f} fps)", file=file)
+    print(f"  - Rendering: {render_time:.2f} s ({100 * render_time / total:.1f}%)", file=file)
+    print(f"  - Waiting on encoder: {encoder.wait_time:.2f} s ({100 * encoder.wait_time / total:.1f}%)", file=file)
+    print(f"  - Encoding (background, {encoder.mode}): {encoder.encode_time:.2f} s", file=file)
@@ -0,0 +1,73 @@
+import numpy as np
+
+# `path` objects are a start point followed by line, quadratic and cubic Bezier
+# segments. Every segment is stored as a cubic (lines and quadratics are raised
+# to degree 3 exactly), so one batch of (S, 4, 2) control points can be
+# flattened with a few array operations whatever the mix of segment types.
+
+FLATNESS_TOLERANCE = 0.25 # max distance in pixels between a curve and its polyline
+MAX_SUBDIVISIONS = 256 # per segment, bounds the cost of huge off-screen curves
+
+def path_cubics(start, segments):
+    """
+    Converts a path's config (`start` point and `segments` list) to cubic Bezier control points.
+
+    Each segment is a dict with a `type` and its end point `to`:
+        {type: line, to: [x, y]}
+        {type: quadratic, control: [x, y], to: [x, y]}
+        {type: cubic, controls: [[x, y], [x, y]], to: [x, y]}
+
+    Returns:
+        np.ndarray: An (S, 4, 2) array of control points.
+    """
+    cubics = np.empty((len(segments), 4, 2))
+    current = np.asarray(start, dtype=float)
+    for i, segment in enumerate(segments):
+        end = np.asarray(segment['to'], dtype=float)
+        kind = segment.get('type', 'line')
+        if kind == 'line':
+            c1, c2 = current + (end - current) / 3, current + 2 * (end - current) / 3
+        elif kind == 'quadratic':
+            control = np.asarray(segment['control'], dtype=float)
+            c1, c2 = current + 2 * (control - current) / 3, end + 2 * (control - end) / 3
+        elif kind == 'cubic':
+            c1, c2 = (np.asarray(c, dtype=float) for c in segment['controls'])
+        else:
+            raise ValueError(f"Unknown path segment type '{kind}'. Use line, quadratic or cubic.")
+        cubics[i] = (current, c1, c2, end)
+        current = end
+    return cubics
+
+def subdivisions(cubics, tolerance=FLATNESS_TOLERANCE):
+    """
+    Returns the number of line segments each cubic needs to stay within `tolerance`
+    of its curve, from Wang's formula: n = sqrt(3/4 * max|second difference| / tolerance).
+    Straight segments get 1; the count grows with the square root of the curve's size.
+    """
+    second = np.maximum(
+        np.linalg.norm(cubics[:, 0] - 2 * cubics[:, 1] + cubics[:, 2], axis=1),
+        np.linalg.norm(cubics[:, 1] - 2 * cubics[:, 2] + cubics[:, 3], axis=1),
+    )
+    n = np.ceil(np.sqrt(0.75 * second / tolerance))
+    return np.clip(n, 1, MAX_SUBDIVISIONS).astype(int)
+
+def flatten_cubics(cubics, tolerance=FLATNESS_TOLERANCE):
+    """
+    Flattens a batch of chained cubics (each starting where the previous one ends)
+    into one polyline, evaluating all segments at once.
+
+    Returns:
+        np.ndarray: A (P, 2) array of points, starting with the first segment's start point.
+    """
+    if len(cubics) == 0:
+        return np.empty((0, 2))
+    counts = subdivisions(cubics, tolerance)
+    total = int(counts.sum())
+    # Segment i is sampled at t = 1/n_i, 2/n_i, ..., 1
+    owner = np.repeat(np.arange(len(cubics)), counts)
+    step = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    t = (step / counts[owner])[:, None]
+    s = 1 - t
+    p0, p1, p2, p3 = (cubics[owner, k] for k in range(4))
+    points = s ** 3 * p0 + 3 * s ** 2 * t * p1 + 3 * s * t ** 2 * p2 + t ** 3 * p3
+    return np.concatenate([cubics[:1, 0], points])
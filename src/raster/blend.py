@@ -0,0 +1,80 @@
+import numpy as np
+from . import kernels
+
+# Translucent shapes are composited into the canvas' float accumulation buffer
+# (see Canvas.blend_buffer) with the premultiplied-alpha "over" operator:
+#     dst = src * alpha + dst * (1 - alpha)
+# Every shape is first reduced to the set of pixels it covers, each listed once,
+# so compositing it is a single array operation however many pixels it has.
+
+def blend_pixels(buffer, xs, ys, colour, alpha):
+    """Composites `colour` at opacity `alpha` over the listed pixels of an (H, W, 3) float buffer."""
+    if len(xs) == 0:
+        return
+    premultiplied = np.array(colour.to_tuple(), dtype=np.float32) * alpha
+    buffer[ys, xs] = premultiplied + buffer[ys, xs] * (1 - alpha)
+
+def blend_mask(buffer, mask, left, top, colour, alpha, clip_rect):
+    """
+    Composites `colour` over the True pixels of a boolean coverage mask whose
+    top-left pixel is at (left, top), cropped to the inclusive `clip_rect`.
+    """
+    height, width = mask.shape
+    x0, y0 = max(left, clip_rect[0]), max(top, clip_rect[1])
+    x1, y1 = min(left + width - 1, clip_rect[2]), min(top + height - 1, clip_rect[3])
+    if x0 > x1 or y0 > y1:
+        return
+    region = buffer[y0:y1 + 1, x0:x1 + 1]
+    covered = mask[y0 - top:y1 - top + 1, x0 - left:x1 - left + 1]
+    premultiplied = np.array(colour.to_tuple(), dtype=np.float32) * alpha
+    region[covered] = premultiplied + region[covered] * (1 - alpha)
+
+class CoverageCollector:
+    """
+    An ImageDraw stand-in that records the pixels a rasterizer draws instead of
+    drawing them, so a shape drawn by several calls (outline and fill, or the
+    three edges of a triangle) can be composited once per pixel.
+    """
+    def __init__(self, clip_rect):
+        self.clip_rect = clip_rect
+        self.chunks = []
+
+    def point(self, xy, fill=None):
+        self.chunks.append(np.asarray(xy, dtype=np.int64).reshape(-1, 2))
+
+    def pixels(self):
+        """Returns the unique on-canvas (xs, ys) drawn so far."""
+        if not self.chunks:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        points = np.concatenate(self.chunks)
+        xmin, ymin, xmax, ymax = self.clip_rect
+        inside = (points[:, 0] >= xmin) & (points[:, 0] <= xmax) & (points[:, 1] >= ymin) & (points[:, 1] <= ymax)
+        points = np.unique(points[inside], axis=0)
+        return points[:, 0], points[:, 1]
+
+def blend_face(vertices, colour, alpha, buffer, z_buffer, subpixel_bits=0):
+    """
+    Composites a translucent convex 3D face over the buffer. It is depth tested
+    against the opaque geometry in `z_buffer` but does not write depth, so faces
+    behind it still show through. Returns the number of pixels blended.
+    """
+    if len(vertices) < 3:
+        return 0
+    kernel = kernels.active()
+    depth = sum(v.z for v in vertices) / len(vertices)
+    bounds = (0, 0, z_buffer.shape[0] - 1, z_buffer.shape[1] - 1)
+    written = 0
+    # The fan's triangles never share a pixel, so each one is composited with one array op
+    for k in range(1, len(vertices) - 1):
+        triangle = np.array([(vertices[0].x, vertices[0].y), (vertices[k].x, vertices[k].y),
+                             (vertices[k + 1].x, vertices[k + 1].y)], dtype=np.float64)
+        if subpixel_bits:
+            from .triangle import to_fixed_point
+            xs, ys = kernel.triangle_pixels_fixed(to_fixed_point(triangle, subpixel_bits), subpixel_bits, *bounds)
+        else:
+            xs, ys = kernel.triangle_pixels(triangle, *bounds)
+        visible = depth < z_buffer[xs, ys]
+        blend_pixels(buffer, xs[visible], ys[visible], colour, alpha)
+        written += int(visible.sum())
+    return written
@@ -1,4 +1,5 @@
 from ..helper import Colour, Point
+from . import kernels
 import numpy as np
 
 def draw_circle_float(centre, radius, colour, draw_context, fill=False):
@@ -32,35 +33,23 @@ def draw_circle_float(centre, radius, colour, draw_context, fill=False):
 
 
 
-def draw_circle_int(centre, radius, colour, draw_context, fill=False):
+def midpoint_circle_offsets(radius):
+    """Returns the (n, 2) (dx, dy) offsets of a midpoint-algorithm circle outline around its centre."""
+    return kernels.active().circle_outline(radius)
+
+def draw_circle_int(centre, radius, colour, draw_context, fill=False, clip_rect=None):
     xc = centre.x
     yc = centre.y
-    x, y = 0, radius
-    p = 1 - radius
-    while x <= y:
-        # 8 symmetric points
-        points = [
-            (xc + x, yc + y),
-            (xc - x, yc + y),
-            (xc + x, yc - y),
-            (xc - x, yc - y),
-            (xc + y, yc + x),
-            (xc - y, yc + x),
-            (xc + y, yc - x),
-            (xc - y, yc - x),
-        ]
-        for px, py in points:
-            draw_context.point((px, py), fill=(colour.r, colour.g, colour.b))
-
-        if p < 0:
-            p += 2*x + 3
-        else:
-            p += 2*(x - y) + 5
-            y -= 1
-        x += 1
+    outline = midpoint_circle_offsets(radius) + (xc, yc)
+    draw_context.point(outline.ravel().tolist(), fill=(colour.r, colour.g, colour.b))
 
     if fill:
-        for y_fill in range(int(yc - radius), int(yc + radius) + 1):
-            for x_fill in range(int(xc - radius), int(xc + radius) + 1):
-                if (x_fill - xc)**2 + (y_fill - yc)**2 <= radius**2:
-                    draw_context.point((x_fill, y_fill), fill=(colour.r, colour.g, colour.b))
+        y_start, y_end = int(yc - radius), int(yc + radius)
+        x_start, x_end = int(xc - radius), int(xc + radius)
+        if clip_rect is not None:
+            # Only scan the part of the bounding box that is on the canvas
+            y_start, y_end = max(y_start, clip_rect[1]), min(y_end, clip_rect[3])
+            x_start, x_end = max(x_start, clip_rect[0]), min(x_end, clip_rect[2])
+        pixels = kernels.active().disk_pixels(xc, yc, radius, x_start, x_end, y_start, y_end)
+        if len(pixels):
+            draw_context.point(pixels.ravel().tolist(), fill=(colour.r, colour.g, colour.b))
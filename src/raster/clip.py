@@ -0,0 +1,94 @@
+# Clipping of 2D primitives to a screen rectangle (xmin, ymin, xmax, ymax),
+# inclusive, so rasterizers only ever step over pixels that can be drawn.
+
+class ClipStats:
+    """Counts, per primitive kind, how many were fully inside, clipped, or rejected."""
+    def __init__(self):
+        self.counts = {}
+
+    def record(self, kind, outcome):
+        counts = self.counts.setdefault(kind, {'inside': 0, 'clipped': 0, 'rejected': 0})
+        counts[outcome] += 1
+
+    def print_report(self):
+        if not self.counts:
+            return
+        print("Clipping:")
+        for kind, counts in self.counts.items():
+            print(f"  - {kind}: {counts['inside']} inside, {counts['clipped']} clipped, {counts['rejected']} rejected")
+
+def clip_line(x0, y0, x1, y1, rect, stats=None):
+    """
+    Clips the Bresenham line from (x0, y0) to (x1, y1) to `rect` in step space.
+    The endpoints are truncated to pixels as `draw_line_bresenham` does, and the
+    range of steps whose pixels lie inside `rect` is solved exactly. A clipped line
+    therefore draws the same pixels as the unclipped one, minus those off the canvas.
+
+    Returns:
+        tuple: (x0, y0, x1, y1, k_start, k_end) for `draw_clipped_line`, or None
+               if no pixel of the line is inside.
+    """
+    x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
+    xmin, ymin, xmax, ymax = rect
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    x_lo, x_hi = _visible_moves(x0, 1 if x0 < x1 else -1, xmin, xmax)
+    y_lo, y_hi = _visible_moves(y0, 1 if y0 < y1 else -1, ymin, ymax)
+    # The major axis moves on every step; see the line kernels for the minor axis
+    if dx >= dy:
+        major, minor, (k_start, k_end), (m_lo, m_hi) = dx, dy, (x_lo, x_hi), (y_lo, y_hi)
+    else:
+        major, minor, (k_start, k_end), (m_lo, m_hi) = dy, dx, (y_lo, y_hi), (x_lo, x_hi)
+    k_start, k_end = max(k_start, 0), min(k_end, major)
+    if minor == 0:
+        if not m_lo <= 0 <= m_hi:
+            return _record(stats, 'lines', 'rejected', None)
+    else:
+        # Steps k whose minor moves (2 * k * minor + major) // (2 * major) lie in [m_lo, m_hi]
+        k_start = max(k_start, _ceil_div(2 * major * m_lo - major, 2 * minor))
+        k_end = min(k_end, _ceil_div(2 * major * (m_hi + 1) - major, 2 * minor) - 1)
+    if k_start > k_end:
+        return _record(stats, 'lines', 'rejected', None)
+    inside = k_start == 0 and k_end == major
+    return _record(stats, 'lines', 'inside' if inside else 'clipped', (x0, y0, x1, y1, k_start, k_end))
+
+def _visible_moves(origin, step, lo, hi):
+    """Returns the range of move counts j for which origin + step * j lies in [lo, hi]."""
+    return (lo - origin, hi - origin) if step > 0 else (origin - hi, origin - lo)
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+def polygon_visible(points, rect, stats=None):
+    """
+    Trivially accepts or rejects a polygon by its bounding box, for polygons filled
+    as triangles whose spans the triangle rasterizer clamps to `rect` itself.
+
+    Returns:
+        bool: False if the polygon lies entirely outside `rect`.
+    """
+    xmin, ymin, xmax, ymax = rect
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    if max(xs) < xmin or min(xs) > xmax or max(ys) < ymin or min(ys) > ymax:
+        return _record(stats, 'polygons', 'rejected', False)
+    inside = min(xs) >= xmin and max(xs) <= xmax and min(ys) >= ymin and max(ys) <= ymax
+    return _record(stats, 'polygons', 'inside' if inside else 'clipped', True)
+
+def clip_circle(center_x, center_y, radius, rect, stats=None):
+    """
+    Trivially accepts or rejects a circle by its bounding box. Partially visible
+    circles are clamped to `rect` by the circle rasterizer itself.
+
+    Returns:
+        bool: False if the circle lies entirely outside `rect`.
+    """
+    xmin, ymin, xmax, ymax = rect
+    if center_x + radius < xmin or center_x - radius > xmax or center_y + radius < ymin or center_y - radius > ymax:
+        return _record(stats, 'circles', 'rejected', False)
+    inside = center_x - radius >= xmin and center_x + radius <= xmax and center_y - radius >= ymin and center_y + radius <= ymax
+    return _record(stats, 'circles', 'inside' if inside else 'clipped', True)
+
+def _record(stats, kind, outcome, result):
+    if stats is not None:
+        stats.record(kind, outcome)
+    return result
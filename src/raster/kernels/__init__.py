@@ -0,0 +1,55 @@
+import importlib
+
+# Rasterizer inner loops, available from interchangeable backends that produce
+# identical pixels:
+#   'numba'  - the reference loops JIT-compiled with Numba (optional dependency)
+#   'numpy'  - vectorized NumPy equivalents
+#   'python' - the plain-Python reference loops
+# 'auto' picks Numba when it is installed and NumPy otherwise.
+BACKENDS = ('numba', 'numpy', 'python')
+_MODULES = {'numba': 'jit', 'numpy': 'vectorized', 'python': 'reference'}
+
+_loaded = {}
+_active = None
+
+def load_backend(name):
+    """Imports and returns the kernel module of a backend. Raises ImportError if it is unavailable."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{name}'. Choose one of: auto, {', '.join(BACKENDS)}.")
+    if name not in _loaded:
+        _loaded[name] = importlib.import_module(f'{__name__}.{_MODULES[name]}')
+    return _loaded[name]
+
+def available_backends():
+    """Returns the names of the backends that can be loaded here."""
+    names = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+def set_backend(name='auto'):
+    """Makes `name` (or the best available backend for 'auto') the one every rasterizer uses."""
+    global _active
+    if name == 'auto':
+        try:
+            _active = load_backend('numba')
+        except ImportError:
+            _active = load_backend('numpy')
+    else:
+        try:
+            _active = load_backend(name)
+        except ImportError as e:
+            raise ValueError(f"Kernel backend '{name}' is not available: {e}")
+    return _active
+
+def active():
+    """Returns the kernel module in use, selecting one automatically on first use."""
+    return _active if _active is not None else set_backend('auto')
+
+def backend_name():
+    kernels = active()
+    return next(name for name, module in _loaded.items() if module is kernels)
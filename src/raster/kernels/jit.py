@@ -0,0 +1,11 @@
+from numba import njit
+from . import reference
+
+# The reference kernels compiled with Numba. `cache=True` stores the machine code
+# next to reference.py (or under NUMBA_CACHE_DIR), so each machine compiles once.
+line_pixels = njit(cache=True)(reference.line_pixels)
+circle_outline = njit(cache=True)(reference.circle_outline)
+disk_pixels = njit(cache=True)(reference.disk_pixels)
+triangle_pixels = njit(cache=True)(reference.triangle_pixels)
+triangle_pixels_fixed = njit(cache=True)(reference.triangle_pixels_fixed)
+depth_test = njit(cache=True)(reference.depth_test)
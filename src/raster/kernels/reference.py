@@ -0,0 +1,193 @@
+import numpy as np
+
+# Plain-Python reference kernels. They only use the subset of Python and NumPy
+# that Numba compiles, so the JIT backend is these same functions under @njit.
+
+def line_pixels(x0, y0, x1, y1, k_start=0, k_end=-1):
+    """
+    Returns the (n, 2) pixels of the Bresenham line from (x0, y0) to (x1, y1), in
+    drawing order. Only steps `k_start` to `k_end` (inclusive, -1 for the last step)
+    are stepped through, so a clipped line costs only its visible pixels.
+    """
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    steps = max(dx, -dy)
+    if k_end < 0 or k_end > steps:
+        k_end = steps
+    err = dx + dy
+    if k_start > 0:
+        # Jump to step k_start: the major axis moves on every step and the minor one
+        # (2 * k * minor + major) // (2 * major) times; each move adds dy (x) or dx (y) to err
+        if dx >= -dy:
+            moves = (2 * k_start * -dy + dx) // (2 * dx)
+            x0 += sx * k_start
+            y0 += sy * moves
+            err += k_start * dy + moves * dx
+        else:
+            moves = (2 * k_start * dx - dy) // (-2 * dy)
+            x0 += sx * moves
+            y0 += sy * k_start
+            err += moves * dy + k_start * dx
+    out = np.empty((max(k_end - k_start + 1, 0), 2), dtype=np.int64)
+    for n in range(k_end - k_start + 1):
+        out[n, 0] = x0
+        out[n, 1] = y0
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+    return out
+
+def circle_outline(radius):
+    """Returns the (n, 2) offsets of a midpoint circle outline, eight symmetric points per step."""
+    out = np.empty((8 * (int(radius) + 2), 2), dtype=np.int64)
+    n = 0
+    x, y = 0, radius
+    p = 1 - radius
+    while x <= y:
+        # The 8 symmetric points: (x, y), (-x, y), (x, -y), (-x, -y), then the same with x and y swapped
+        for s in range(8):
+            u, v = (y, x) if s >= 4 else (x, y)
+            out[n, 0] = -u if s & 1 else u
+            out[n, 1] = -v if s & 2 else v
+            n += 1
+        if p < 0:
+            p += 2*x + 3
+        else:
+            p += 2*(x - y) + 5
+            y -= 1
+        x += 1
+    return out[:n]
+
+def disk_pixels(xc, yc, radius, x_start, x_end, y_start, y_end):
+    """Returns the (n, 2) pixels in the inclusive box whose distance to (xc, yc) is at most `radius`, row by row."""
+    width = max(x_end - x_start + 1, 0)
+    height = max(y_end - y_start + 1, 0)
+    out = np.empty((width * height, 2), dtype=np.int64)
+    n = 0
+    r2 = radius * radius
+    for y in range(y_start, y_end + 1):
+        for x in range(x_start, x_end + 1):
+            if (x - xc)**2 + (y - yc)**2 <= r2:
+                out[n, 0] = x
+                out[n, 1] = y
+                n += 1
+    return out[:n]
+
+def triangle_pixels(triangle, col_min, row_min, col_max, row_max):
+    """
+    Returns the pixel x and y arrays of one (3, 2) float triangle, using the span rule
+    of `triangle_spans` (rows [int(x_left), int(x_right)), edges oriented top to bottom),
+    clamped to the inclusive bounds.
+    """
+    min_y = int(min(triangle[0, 1], triangle[1, 1], triangle[2, 1]))
+    max_y = int(max(triangle[0, 1], triangle[1, 1], triangle[2, 1]))
+    min_y = max(min_y, row_min)
+    max_y = min(max_y, row_max)
+    rows = max(max_y - min_y + 1, 0)
+    starts = np.zeros(rows, dtype=np.int64)
+    ends = np.zeros(rows, dtype=np.int64)
+    total = 0
+    for r in range(rows):
+        y = float(min_y + r)
+        crossings = 0
+        x_left = np.inf
+        x_right = -np.inf
+        for e in range(3):
+            x1, y1 = triangle[e, 0], triangle[e, 1]
+            x2, y2 = triangle[(e + 1) % 3, 0], triangle[(e + 1) % 3, 1]
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            if y1 <= y < y2:
+                x = (y - y1) * (x2 - x1) / (y2 - y1) + x1
+                crossings += 1
+                x_left = min(x_left, x)
+                x_right = max(x_right, x)
+        if crossings >= 2:
+            starts[r] = max(int(x_left), col_min)
+            ends[r] = max(min(int(x_right), col_max + 1), starts[r])
+            total += ends[r] - starts[r]
+    xs = np.empty(total, dtype=np.int64)
+    ys = np.empty(total, dtype=np.int64)
+    n = 0
+    for r in range(rows):
+        for x in range(starts[r], ends[r]):
+            xs[n] = x
+            ys[n] = min_y + r
+            n += 1
+    return xs, ys
+
+def triangle_pixels_fixed(triangle, bits, col_min, row_min, col_max, row_max):
+    """
+    Returns the pixel x and y arrays of one (3, 2) int64 triangle in fixed point with
+    `bits` fractional bits, clamped to the inclusive bounds. A pixel is covered when
+    its centre is inside the triangle, or exactly on a top or left edge (the top-left
+    rule), so triangles sharing an edge cover each pixel along it exactly once.
+
+    Each edge's integer edge function is solved per row for the range of pixel
+    centres on its inner side, so no pixel outside the triangle is visited.
+    """
+    one = 1 << bits
+    half = one >> 1
+    vx = np.empty(3, dtype=np.int64)
+    vy = np.empty(3, dtype=np.int64)
+    for k in range(3):
+        vx[k] = triangle[k, 0]
+        vy[k] = triangle[k, 1]
+    area = (vx[1] - vx[0]) * (vy[2] - vy[0]) - (vy[1] - vy[0]) * (vx[2] - vx[0])
+    if area == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if area < 0:
+        # Make the winding positive so the inside is where every edge function is >= 0
+        vx[1], vx[2] = vx[2], vx[1]
+        vy[1], vy[2] = vy[2], vy[1]
+    min_y = max(min(vy[0], vy[1], vy[2]) >> bits, row_min)
+    max_y = min(max(vy[0], vy[1], vy[2]) >> bits, row_max)
+    box_lo = max(min(vx[0], vx[1], vx[2]) >> bits, col_min)
+    box_hi = min(max(vx[0], vx[1], vx[2]) >> bits, col_max)
+    rows = max(max_y - min_y + 1, 0)
+    starts = np.zeros(rows, dtype=np.int64)
+    ends = np.zeros(rows, dtype=np.int64)
+    total = 0
+    for r in range(rows):
+        py = (min_y + r) * one + half
+        lo, hi = box_lo, box_hi
+        for e in range(3):
+            x1, y1 = vx[e], vy[e]
+            dx, dy = vx[(e + 1) % 3] - x1, vy[(e + 1) % 3] - y1
+            # Top or left edges keep centres lying exactly on them; the others drop them
+            bias = 0 if dy < 0 or (dy == 0 and dx > 0) else -1
+            # Edge function plus bias at pixel centre px is c - dy * px, which must be >= 0
+            c = dx * (py - y1) + dy * x1 + bias
+            if dy > 0:
+                hi = min(hi, (c // dy - half) // one)
+            elif dy < 0:
+                lo = max(lo, -((half + c // -dy) // one))
+            elif c < 0:
+                hi = lo - 1
+        starts[r] = lo
+        ends[r] = max(hi + 1, lo)
+        total += ends[r] - starts[r]
+    xs = np.empty(total, dtype=np.int64)
+    ys = np.empty(total, dtype=np.int64)
+    n = 0
+    for r in range(rows):
+        for x in range(starts[r], ends[r]):
+            xs[n] = x
+            ys[n] = min_y + r
+            n += 1
+    return xs, ys
+
+def depth_test(z_buffer, xs, ys, depth):
+    """Writes `depth` to every listed pixel where it is nearer than the Z-buffer; returns the mask of those pixels."""
+    passed = np.zeros(len(xs), dtype=np.bool_)
+    for i in range(len(xs)):
+        if depth < z_buffer[xs[i], ys[i]]:
+            z_buffer[xs[i], ys[i]] = depth
+            passed[i] = True
+    return passed
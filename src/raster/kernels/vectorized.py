@@ -0,0 +1,79 @@
+import numpy as np
+from . import reference
+
+# NumPy kernels: closed forms of the reference loops, producing identical pixels.
+
+def line_pixels(x0, y0, x1, y1, k_start=0, k_end=-1):
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    steps = max(dx, dy)
+    if k_end < 0 or k_end > steps:
+        k_end = steps
+    k = np.arange(k_start, k_end + 1, dtype=np.int64)
+    # Bresenham steps the minor axis whenever the accumulated error passes half a pixel
+    if dx >= dy:
+        minor = (2 * k * dy + dx) // (2 * dx) if dx else k * 0
+        return np.column_stack([x0 + sx * k, y0 + sy * minor])
+    minor = (2 * k * dx + dy) // (2 * dy)
+    return np.column_stack([x0 + sx * minor, y0 + sy * k])
+
+def circle_outline(radius):
+    if radius != int(radius):
+        return reference.circle_outline(radius)
+    radius = int(radius)
+    # The midpoint rule picks the y whose midpoint (x, y - 1/2) is still inside the circle
+    x = np.arange(radius + 1, dtype=np.int64)
+    y = (np.floor(np.sqrt(4.0 * (radius * radius - x * x))).astype(np.int64) + 1) // 2
+    keep = x <= y
+    x, y = x[keep], y[keep]
+    octants = [(x, y), (-x, y), (x, -y), (-x, -y), (y, x), (-y, x), (y, -x), (-y, -x)]
+    return np.stack([np.column_stack(o) for o in octants], axis=1).reshape(-1, 2)
+
+def disk_pixels(xc, yc, radius, x_start, x_end, y_start, y_end):
+    if x_end < x_start or y_end < y_start:
+        return np.empty((0, 2), dtype=np.int64)
+    ys, xs = np.mgrid[y_start:y_end + 1, x_start:x_end + 1]
+    inside = (xs - xc)**2 + (ys - yc)**2 <= radius * radius
+    return np.column_stack([xs[inside], ys[inside]]).astype(np.int64)
+
+def triangle_pixels(triangle, col_min, row_min, col_max, row_max):
+    from ..triangle import triangle_spans, span_pixels
+    return span_pixels(*triangle_spans(triangle, row_min, row_max), col_min, col_max)
+
+def triangle_pixels_fixed(triangle, bits, col_min, row_min, col_max, row_max):
+    from ..triangle import span_pixels
+    one = 1 << bits
+    half = one >> 1
+    tri = np.asarray(triangle, dtype=np.int64)
+    (ax, ay), (bx, by), (cx, cy) = tri
+    area = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    if area == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    if area < 0:
+        tri = tri[[0, 2, 1]]
+    min_y = max(int(tri[:, 1].min()) >> bits, row_min)
+    max_y = min(int(tri[:, 1].max()) >> bits, row_max)
+    rows = np.arange(min_y, max_y + 1, dtype=np.int64)
+    lo = np.full(len(rows), max(int(tri[:, 0].min()) >> bits, col_min), dtype=np.int64)
+    hi = np.full(len(rows), min(int(tri[:, 0].max()) >> bits, col_max), dtype=np.int64)
+    py = rows * one + half
+    # The same per-row solution of each integer edge function as the reference, for all rows at once
+    for (x1, y1), (x2, y2) in zip(tri, np.roll(tri, -1, axis=0)):
+        dx, dy = x2 - x1, y2 - y1
+        bias = 0 if dy < 0 or (dy == 0 and dx > 0) else -1
+        c = dx * (py - y1) + dy * x1 + bias
+        if dy > 0:
+            hi = np.minimum(hi, (c // dy - half) // one)
+        elif dy < 0:
+            lo = np.maximum(lo, -((half + c // -dy) // one))
+        else:
+            hi = np.where(c < 0, lo - 1, hi)
+    return span_pixels(rows, lo, np.maximum(hi + 1, lo))
+
+def depth_test(z_buffer, xs, ys, depth):
+    # A batch never lists a pixel twice, so one masked assignment suffices
+    passed = depth < z_buffer[xs, ys]
+    z_buffer[xs[passed], ys[passed]] = depth
+    return passed
@@ -1,4 +1,5 @@
 from ..helper import Colour, Point
+from . import kernels
 
 def draw_line_wrong(x0, y0, x1, y1, colour, draw_context):
     """
@@ -16,27 +17,18 @@ def draw_line_wrong(x0, y0, x1, y1, colour, draw_context):
 def draw_line_bresenham(x0, y0, x1, y1, colour, draw_context):
     """
     Rasterises a straight line between (x0, y0) and (x1, y1)
-    using Bresenham's algorithm.
+    using Bresenham's algorithm (stepped by the active kernel backend).
     """
-    dx = abs(x1 - x0)
-    dy = -abs(y1 - y0)
-    sx = 1 if x0 < x1 else -1
-    sy = 1 if y0 < y1 else -1
-    err = dx + dy  # error term
+    pixels = kernels.active().line_pixels(int(x0), int(y0), int(x1), int(y1))
+    draw_context.point(pixels.ravel().tolist(), fill=(colour.r, colour.g, colour.b))
 
-    while True:
-        draw_context.point((x0, y0), fill=(colour.r, colour.g, colour.b))
-
-        if x0 == x1 and y0 == y1:
-            break
-
-        e2 = 2 * err
-        if e2 >= dy:
-            err += dy
-            x0 += sx
-        if e2 <= dx:
-            err += dx
-            y0 += sy
+def draw_clipped_line(segment, colour, draw_context):
+    """
+    Draws a line clipped by `clip_line`: only the steps of its (x0, y0, x1, y1)
+    Bresenham line from k_start to k_end, i.e. the pixels inside the clip rectangle.
+    """
+    pixels = kernels.active().line_pixels(*segment)
+    draw_context.point(pixels.ravel().tolist(), fill=(colour.r, colour.g, colour.b))
 
 
 
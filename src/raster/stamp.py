@@ -0,0 +1,144 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+from .circle import midpoint_circle_offsets
+from .triangle import triangle_spans, span_pixels
+
+# Repeated 2D shapes (the same circle radius, the same polygon outline) are
+# rasterized once into a coverage mask, then pasted wherever they are drawn.
+
+SUBPIXEL_BUCKETS = 4 # per axis; positions are snapped to 1/SUBPIXEL_BUCKETS of a pixel
+STAMP_CACHE_MB = 16
+MAX_STAMP_PIXELS = 512 * 512 # larger shapes are rasterized directly instead of cached
+
+class StampCache:
+    """
+    An LRU cache of coverage masks, bounded by the bytes the masks occupy.
+
+    Each entry is (mask, offset_x, offset_y): a Pillow 'L' image that is 255 where
+    the shape covers a pixel, and the position of its top-left pixel relative to
+    the pixel the shape is anchored at.
+    """
+    def __init__(self, max_bytes=STAMP_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        """Returns the stamp for `key`, calling `build()` for a (mask array, offset_x, offset_y) on a miss."""
+        stamp = self.entries.get(key)
+        if stamp is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return stamp
+
+        self.misses += 1
+        from PIL import Image
+        mask, offset_x, offset_y = build()
+        stamp = (Image.fromarray(mask.astype(np.uint8) * 255), offset_x, offset_y)
+        self.entries[key] = stamp
+        self.bytes_used += mask.size
+        while self.bytes_used > self.max_bytes and len(self.entries) > 1:
+            _, (old_mask, _, _) = self.entries.popitem(last=False)
+            self.bytes_used -= old_mask.width * old_mask.height
+            self.evictions += 1
+        return stamp
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def print_report(self):
+        if self.hits + self.misses == 0:
+            return
+        print(f"Stamp cache: {self.hits} hits, {self.misses} misses ({100 * self.hit_rate():.1f}% hit rate), "
+              f"{len(self.entries)} stamps in {self.bytes_used / 1024:.1f} of {self.max_bytes / 1024:.0f} KiB, "
+              f"{self.evictions} evicted")
+
+# Shared by every render so stamps carry over between frames
+stamp_cache = StampCache()
+
+def _split_position(value):
+    """Splits a coordinate into its whole pixel and its sub-pixel bucket."""
+    whole = int(np.floor(value))
+    bucket = int((value - whole) * SUBPIXEL_BUCKETS)
+    return whole, bucket
+
+def circle_mask(radius, bucket_x=0, bucket_y=0):
+    """
+    Rasterizes a filled circle like `draw_circle_int`: its midpoint outline plus
+    every pixel within `radius` of a centre offset by the sub-pixel buckets.
+    """
+    extent = int(np.ceil(radius)) + 1
+    frac_x, frac_y = bucket_x / SUBPIXEL_BUCKETS, bucket_y / SUBPIXEL_BUCKETS
+    dy, dx = np.ogrid[-extent:extent + 1, -extent:extent + 1]
+    mask = (dx - frac_x)**2 + (dy - frac_y)**2 <= radius**2
+    outline = np.array(midpoint_circle_offsets(radius)).astype(int)
+    mask[outline[:, 1] + extent, outline[:, 0] + extent] = True
+    return mask, -extent, -extent
+
+def polygon_mask(points, triangles):
+    """Rasterizes triangulated screen-space `points` (relative to their anchor pixel) like `fill_triangles`."""
+    offset_x, offset_y = int(np.floor(points[:, 0].min())), int(np.floor(points[:, 1].min()))
+    local = points - (offset_x, offset_y)
+    mask = np.zeros((int(local[:, 1].max()) + 2, int(local[:, 0].max()) + 2), dtype=bool)
+    for triangle in local[triangles]:
+        xs, ys = span_pixels(*triangle_spans(triangle))
+        mask[ys, xs] = True
+    return mask, offset_x, offset_y
+
+def blit_stamp(image, stamp, x, y, colour, clip_rect, alpha=1.0):
+    """
+    Fills the stamp's covered pixels with `colour`, anchored at pixel (x, y) and
+    cropped to the inclusive `clip_rect`. Returns False if nothing was on screen.
+    With `alpha` below 1, `image` is the canvas' float blend buffer and the colour
+    is composited over it instead.
+    """
+    mask, offset_x, offset_y = stamp
+    left, top = x + offset_x, y + offset_y
+    if alpha < 1:
+        from .blend import blend_mask
+        blend_mask(image, np.asarray(mask) > 0, left, top, colour, alpha, clip_rect)
+        return True
+    x0, y0 = max(left, clip_rect[0]), max(top, clip_rect[1])
+    x1, y1 = min(left + mask.width - 1, clip_rect[2]), min(top + mask.height - 1, clip_rect[3])
+    if x0 > x1 or y0 > y1:
+        return False
+    if (x0, y0, x1, y1) != (left, top, left + mask.width - 1, top + mask.height - 1):
+        mask = mask.crop((x0 - left, y0 - top, x1 - left + 1, y1 - top + 1))
+    image.paste(colour.to_tuple(), (x0, y0, x1 + 1, y1 + 1), mask)
+    return True
+
+def stamp_circle(image, centre_x, centre_y, radius, colour, clip_rect, cache=stamp_cache, alpha=1.0):
+    """
+    Draws a filled circle through the stamp cache. Returns False (drawing nothing)
+    if the circle is too large to cache, so the caller can rasterize it directly.
+    """
+    if (2 * radius + 3) ** 2 > MAX_STAMP_PIXELS:
+        return False
+    x, bucket_x = _split_position(centre_x)
+    y, bucket_y = _split_position(centre_y)
+    stamp = cache.get(('circle', radius, bucket_x, bucket_y), lambda: circle_mask(radius, bucket_x, bucket_y))
+    blit_stamp(image, stamp, x, y, colour, clip_rect, alpha)
+    return True
+
+def stamp_polygon(image, screen_vertices, triangles, colour, clip_rect, cache=stamp_cache, alpha=1.0):
+    """
+    Draws a triangulated polygon through the stamp cache, keyed by its outline
+    relative to its top-left corner, so translated copies share one stamp.
+    Returns False (drawing nothing) if the polygon is too large to cache.
+    """
+    points = np.asarray(screen_vertices, dtype=float)
+    x, _ = _split_position(points[:, 0].min())
+    y, _ = _split_position(points[:, 1].min())
+    if (np.ptp(points[:, 0]) + 2) * (np.ptp(points[:, 1]) + 2) > MAX_STAMP_PIXELS:
+        return False
+    # Snap the outline to the sub-pixel grid so nearby positions share a stamp
+    local = np.round((points - (x, y)) * SUBPIXEL_BUCKETS) / SUBPIXEL_BUCKETS
+    digest = hashlib.blake2b(local.tobytes() + np.ascontiguousarray(triangles).tobytes(), digest_size=16).digest()
+    stamp = cache.get(('polygon', digest), lambda: polygon_mask(local, triangles))
+    blit_stamp(image, stamp, x, y, colour, clip_rect, alpha)
+    return True
@@ -1,43 +1,161 @@
-from ..helper import Colour, Point
-from .line import draw_line_bresenham
-# The edge function calculates the signed area of a triangle formed by three points.
-# The sign of the result tells us which side of the line segment AB point C lies on.
-def edge_function(A, B, C):
-    return (B.x - A.x) * (C.y - A.y) - (B.y - A.y) * (C.x - A.x)
-
-# This is the main function to draw and rasterize the triangle.
-# It takes the three vertices and a Pillow ImageDraw object as input.
-def fill_triangle(A, B, C, colour, draw_context):
-    ABC = edge_function(A, B, C)
-
-    # Check if the triangle is clockwise or counter-clockwise
-    is_clockwise = ABC < 0
-
-    # Get the bounding box of the triangle to reduce the number of pixels to check.
-    minX = min(A.x, B.x, C.x)
-    minY = min(A.y, B.y, C.y)
-    maxX = max(A.x, B.x, C.x)
-    maxY = max(A.y, B.y, C.y)
-
-    P = Point(0, 0)
-    for P.y in range(int(minY), int(maxY)):
-        for P.x in range(int(minX), int(maxX)):
-            # Calculate the edge functions for the point P with respect to each edge.
-            # These values are proportional to the area of the sub-triangles (ABP, BCP, CAP).
-            ABP = edge_function(A, B, P)
-            BCP = edge_function(B, C, P)
-            CAP = edge_function(C, A, P)
-
-            # Check if the point is inside the triangle.
-            if is_clockwise:
-                if ABP <= 0 and BCP <= 0 and CAP <= 0:
-                    draw_context.point((P.x, P.y), fill=(colour.r, colour.g, colour.b))
-            else:
-                if ABP >= 0 and BCP >= 0 and CAP >= 0:
-                    draw_context.point((P.x, P.y), fill=(colour.r, colour.g, colour.b))
-
-def draw_triangle(A, B, C, colour, draw_context, fill=False):
-    # Just draw the 3 edges of the triangle
-    draw_line_bresenham(A.x, A.y, B.x, B.y, colour, draw_context)
-    draw_line_bresenham(B.x, B.y, C.x, C.y, colour, draw_context)
-    draw_line_bresenham(C.x, C.y, A.x, A.y, colour, draw_context)
\ No newline at end of file
+import numpy as np
+from ..helper import Colour
+from .line import draw_clipped_line, draw_line_bresenham
+from .clip import clip_line
+from . import kernels
+
+def draw_triangle(A, B, C, colour, draw_context, fill=False, clip_rect=None, clip_stats=None):
+    # Just draw the 3 edges of the triangle, each clipped to clip_rect if given
+    for P, Q in ((A, B), (B, C), (C, A)):
+        if clip_rect is None:
+            draw_line_bresenham(P.x, P.y, Q.x, Q.y, colour, draw_context)
+            continue
+        segment = clip_line(P.x, P.y, Q.x, Q.y, clip_rect, clip_stats)
+        if segment is not None:
+            draw_clipped_line(segment, colour, draw_context)
+
+# --- Batched triangle rasterizer ---
+
+# Stand-in bounds for unclipped triangles; far outside any canvas but safe for int64 kernels
+UNBOUNDED = 1 << 40
+
+# Fixed-point vertices are clamped to this magnitude so edge functions stay within int64
+FIXED_POINT_LIMIT = (1 << 30) - 1
+
+def to_fixed_point(points, bits):
+    """Rounds float screen coordinates to int64 fixed point with `bits` fractional bits."""
+    fixed = np.rint(np.asarray(points, dtype=np.float64) * (1 << bits))
+    return np.clip(fixed, -FIXED_POINT_LIMIT, FIXED_POINT_LIMIT).astype(np.int64)
+
+def triangle_spans(triangle, row_min=None, row_max=None):
+    """
+    Computes the horizontal pixel spans covered by one triangle, vectorized over its rows.
+
+    Uses the scanline rule of the original polygon filler: an edge crosses row y when
+    min(y1, y2) <= y < max(y1, y2), and a row is filled over [int(x_left), int(x_right)).
+    Edges are always evaluated from their upper endpoint, so two triangles sharing an
+    edge compute identical crossings and cover every pixel along it exactly once.
+
+    Returns:
+        tuple: (rows, x_start, x_end) integer arrays, one entry per non-empty row.
+    """
+    tri = np.asarray(triangle, dtype=float)
+    min_y, max_y = int(tri[:, 1].min()), int(tri[:, 1].max())
+    if row_min is not None:
+        min_y, max_y = max(min_y, row_min), min(max_y, row_max)
+    rows = np.arange(min_y, max_y + 1, dtype=float)
+    if len(rows) == 0:
+        empty = np.empty(0, dtype=int)
+        return empty, empty, empty
+
+    p1 = tri
+    p2 = np.roll(tri, -1, axis=0)
+    # Orient each edge top to bottom so the crossing is computed the same way for both neighbours
+    swap = p1[:, 1] > p2[:, 1]
+    top = np.where(swap[:, None], p2, p1)
+    bottom = np.where(swap[:, None], p1, p2)
+    x1, y1 = top[:, 0:1], top[:, 1:2]
+    x2, y2 = bottom[:, 0:1], bottom[:, 1:2]
+
+    crosses = (y1 <= rows) & (rows < y2)  # (3, rows); horizontal edges never cross
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (rows - y1) * (x2 - x1) / (y2 - y1) + x1
+    hits = crosses.sum(axis=0) >= 2
+    x_left = np.where(crosses, x, np.inf).min(axis=0)[hits]
+    x_right = np.where(crosses, x, -np.inf).max(axis=0)[hits]
+    return rows[hits].astype(int), np.trunc(x_left).astype(int), np.trunc(x_right).astype(int)
+
+def span_pixels(rows, x_start, x_end, col_min=None, col_max=None):
+    """Expands spans [x_start, x_end) into flat pixel x and y arrays, optionally clamped to [col_min, col_max]."""
+    if col_min is not None:
+        x_start = np.maximum(x_start, col_min)
+        x_end = np.minimum(x_end, col_max + 1)
+    lengths = np.maximum(x_end - x_start, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=int)
+        return empty, empty
+    ys = np.repeat(rows, lengths)
+    # Position of each pixel within its span, added to the span start
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = np.repeat(x_start, lengths) + offsets
+    return xs, ys
+
+def fill_triangles(triangles, colours, draw_context, z_buffer=None, depths=None, clip_rect=None, id_buffer=None, ids=None,
+                   subpixel_bits=0):
+    """
+    Fills a batch of screen-space triangles, each rasterized by the active kernel backend.
+    With `subpixel_bits`, vertices keep that many fractional bits and pixels are sampled
+    at their centres with the top-left rule, so adjacent triangles never overlap or crack;
+    otherwise the integer span rule of `triangle_spans` is used.
+
+    Args:
+        triangles: A (T, 3, 2) array-like of screen coordinates.
+        colours: A single Colour for all triangles, or one Colour per triangle.
+        draw_context: A Pillow ImageDraw object, or None for a depth-only pass.
+        z_buffer (np.ndarray): Optional (width, height) depth buffer.
+        depths: One depth per triangle, required with a z_buffer.
+        clip_rect (tuple): Optional inclusive (xmin, ymin, xmax, ymax) to clamp spans to.
+        id_buffer (np.ndarray): Optional (width, height, ...) buffer that receives ids[i]
+                                wherever triangle i passes the depth test.
+        ids: One id per triangle, required with an id_buffer.
+        subpixel_bits (int): Fractional bits of fixed-point vertex precision, 0 for integer spans.
+
+    Returns:
+        int: The number of pixels written (i.e. that passed the depth test).
+    """
+    if clip_rect is None and z_buffer is not None:
+        clip_rect = (0, 0, z_buffer.shape[0] - 1, z_buffer.shape[1] - 1)
+    col_min, row_min, col_max, row_max = clip_rect if clip_rect is not None else (-UNBOUNDED, -UNBOUNDED, UNBOUNDED, UNBOUNDED)
+    single_colour = isinstance(colours, Colour)
+    kernel = kernels.active()
+    triangles = np.asarray(triangles, dtype=np.float64)
+    if subpixel_bits:
+        triangles = to_fixed_point(triangles, subpixel_bits)
+
+    written = 0
+    pending_xs, pending_ys = [], []
+    for i, triangle in enumerate(triangles):
+        if subpixel_bits:
+            xs, ys = kernel.triangle_pixels_fixed(triangle, subpixel_bits, col_min, row_min, col_max, row_max)
+        else:
+            xs, ys = kernel.triangle_pixels(triangle, col_min, row_min, col_max, row_max)
+        if z_buffer is not None:
+            # A single triangle never covers a pixel twice, so the kernel can test and write in one pass
+            passed = kernel.depth_test(z_buffer, xs, ys, np.float64(depths[i]))
+            xs, ys = xs[passed], ys[passed]
+        if id_buffer is not None:
+            id_buffer[xs, ys] = ids[i]
+        written += len(xs)
+        if draw_context is None or len(xs) == 0:
+            continue
+        if single_colour and z_buffer is None:
+            # Without depth testing the order does not matter, so draw the whole batch at once
+            pending_xs.append(xs)
+            pending_ys.append(ys)
+        else:
+            colour = colours if single_colour else colours[i]
+            draw_context.point(np.column_stack([xs, ys]).ravel().tolist(), fill=colour.to_tuple())
+
+    if pending_xs:
+        xy = np.column_stack([np.concatenate(pending_xs), np.concatenate(pending_ys)])
+        draw_context.point(xy.ravel().tolist(), fill=colours.to_tuple())
+    return written
+
+def fill_face(vertices, color, draw_func, z_buffer=None, id_buffer=None, face_id=None, subpixel_bits=0):
+    """
+    Fills one convex 3D face (a list of projected points): fan-triangulates the
+    face and fills it through `fill_triangles` at the face's average depth.
+    With an `id_buffer`, `face_id` is written to every pixel the face wins.
+    """
+    if len(vertices) < 3:
+        return 0
+    points = [(v.x, v.y) for v in vertices]
+    triangles = [(points[0], points[k], points[k + 1]) for k in range(1, len(points) - 1)]
+    depths = None
+    if z_buffer is not None:
+        avg_z = sum(v.z for v in vertices) / len(vertices)
+        depths = [avg_z] * len(triangles)
+    ids = None if id_buffer is None else [face_id] * len(triangles)
+    return fill_triangles(triangles, color, draw_func, z_buffer, depths, id_buffer=id_buffer, ids=ids,
+                          subpixel_bits=subpixel_bits)
@@ -0,0 +1,163 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+# Triangulations keyed by a hash of the polygon's vertex content. Polygons are
+# triangulated in their own (config) coordinates, which any 2D transform maps
+# affinely, so the cached index lists stay valid while the object moves.
+TRIANGULATION_CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+cache_stats = {'hits': 0, 'misses': 0}
+
+def triangulate_polygon(vertices, holes=()):
+    """
+    Triangulates a simple polygon, convex or concave, optionally with holes.
+
+    Args:
+        vertices: The outer ring as a sequence of (x, y) points.
+        holes: A sequence of rings, each a sequence of (x, y) points, inside the outer ring.
+
+    Returns:
+        np.ndarray: A read-only (T, 3) array of indices into the outer vertices
+                    followed by each hole's vertices, in that order.
+    """
+    rings = [np.asarray(vertices, dtype=float).reshape(-1, 2)]
+    rings += [np.asarray(hole, dtype=float).reshape(-1, 2) for hole in holes]
+    key = hashlib.blake2b(b''.join(r.tobytes() + len(r).to_bytes(4, 'little') for r in rings), digest_size=16).digest()
+
+    triangles = _cache.get(key)
+    if triangles is not None:
+        _cache.move_to_end(key)
+        cache_stats['hits'] += 1
+        return triangles
+
+    cache_stats['misses'] += 1
+    triangles = _triangulate(rings)
+    triangles.flags.writeable = False
+    _cache[key] = triangles
+    if len(_cache) > TRIANGULATION_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return triangles
+
+def _signed_area(points):
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * (np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+def _clean_ring(points, offset):
+    """Returns the indices of a ring without repeated consecutive points (or a repeated closing point)."""
+    keep = np.any(points != np.roll(points, 1, axis=0), axis=1)
+    if not keep.any():
+        keep[0] = True
+    return list(np.flatnonzero(keep) + offset)
+
+def _segments_cross(a, b, c, d):
+    """True if segments ab and cd properly intersect (touching at endpoints does not count)."""
+    def orient(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    d1, d2 = orient(c, d, a), orient(c, d, b)
+    d3, d4 = orient(a, b, c), orient(a, b, d)
+    return ((d1 > 0) != (d2 > 0)) and ((d3 > 0) != (d4 > 0)) and d1 * d2 != 0 and d3 * d4 != 0
+
+def _point_in_ring(p, ring):
+    x, y = ring[:, 0], ring[:, 1]
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    crosses = (y > p[1]) != (y2 > p[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_at = x + (p[1] - y) * (x2 - x) / (y2 - y)
+    return bool(np.count_nonzero(crosses & (p[0] < x_at)) % 2)
+
+def _bridge_hole(ring, hole, points, hole_rings):
+    """Splices a hole into the ring through a bridge from its rightmost vertex to a visible ring vertex."""
+    m = max(range(len(hole)), key=lambda k: (points[hole[k]][0], -points[hole[k]][1]))
+    hole = hole[m:] + hole[:m]
+    pm = points[hole[0]]
+
+    edges = [(ring[k], ring[(k + 1) % len(ring)]) for k in range(len(ring))]
+    for other in hole_rings:
+        edges += [(other[k], other[(k + 1) % len(other)]) for k in range(len(other))]
+
+    candidates = sorted(range(len(ring)), key=lambda k: np.sum((points[ring[k]] - pm) ** 2))
+    for k in candidates:
+        pk = points[ring[k]]
+        if any(_segments_cross(pm, pk, points[a], points[b]) for a, b in edges):
+            continue
+        midpoint = (pm + pk) / 2
+        if any(_point_in_ring(midpoint, points[other]) for other in hole_rings):
+            continue
+        # Walk ring -> bridge -> around the hole -> back across the bridge -> rest of the ring
+        return ring[:k + 1] + hole + [hole[0]] + ring[k:]
+    # No visible vertex (malformed input): attach to the nearest one anyway
+    k = candidates[0]
+    return ring[:k + 1] + hole + [hole[0]] + ring[k:]
+
+def _triangulate(rings):
+    points = np.concatenate(rings)
+    offsets = np.cumsum([0] + [len(r) for r in rings])
+
+    ring = _clean_ring(rings[0], 0)
+    if _signed_area(points[ring]) < 0:
+        ring.reverse()
+    holes = []
+    for i, hole_points in enumerate(rings[1:], start=1):
+        hole = _clean_ring(hole_points, offsets[i])
+        if len(hole) < 3:
+            continue
+        if _signed_area(points[hole]) > 0:
+            hole.reverse()
+        holes.append(hole)
+    # Bridge holes right to left so earlier bridges never block later ones
+    holes.sort(key=lambda h: -points[h][:, 0].max())
+    for i, hole in enumerate(holes):
+        ring = _bridge_hole(ring, hole, points, holes[i + 1:])
+
+    return _ear_clip(ring, points)
+
+def _ear_clip(ring, points):
+    """Ear clipping on a counter-clockwise ring of point indices (which may repeat at bridges)."""
+    triangles = []
+    ring = list(ring)
+    guard = 0
+    while len(ring) > 3:
+        pts = points[ring]
+        prev_pts = np.roll(pts, 1, axis=0)
+        next_pts = np.roll(pts, -1, axis=0)
+        cross = ((pts[:, 0] - prev_pts[:, 0]) * (next_pts[:, 1] - pts[:, 1])
+                 - (pts[:, 1] - prev_pts[:, 1]) * (next_pts[:, 0] - pts[:, 0]))
+        reflex = pts[cross <= 0]
+
+        ear = None
+        for i in np.flatnonzero(cross > 0):
+            a, b, c = prev_pts[i], pts[i], next_pts[i]
+            if len(reflex) and _any_inside(reflex, a, b, c):
+                continue
+            ear = i
+            break
+
+        if ear is None:
+            # Degenerate or self-intersecting input: drop the flattest vertex to make progress
+            ear = int(np.argmin(np.abs(cross)))
+            guard += 1
+            if guard > len(points) * 2:
+                break
+            if abs(cross[ear]) == 0:
+                ring.pop(ear)
+                continue
+        n = len(ring)
+        triangles.append((ring[(ear - 1) % n], ring[ear], ring[(ear + 1) % n]))
+        ring.pop(ear)
+
+    if len(ring) == 3:
+        triangles.append(tuple(ring))
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+def _any_inside(candidates, a, b, c):
+    """True if any candidate lies inside or on triangle abc, ignoring points equal to its corners."""
+    not_corner = ~(np.all(candidates == a, axis=1) | np.all(candidates == b, axis=1) | np.all(candidates == c, axis=1))
+    p = candidates[not_corner]
+    if len(p) == 0:
+        return False
+    d1 = (b[0] - a[0]) * (p[:, 1] - a[1]) - (b[1] - a[1]) * (p[:, 0] - a[0])
+    d2 = (c[0] - b[0]) * (p[:, 1] - b[1]) - (c[1] - b[1]) * (p[:, 0] - b[0])
+    d3 = (a[0] - c[0]) * (p[:, 1] - c[1]) - (a[1] - c[1]) * (p[:, 0] - c[0])
+    return bool(np.any((d1 >= 0) & (d2 >= 0) & (d3 >= 0)))
@@ -0,0 +1,230 @@
+import sys
+import numpy as np
+from collections import namedtuple
+
+from src.helper import Colour, material_opacity
+from src.geometry import unit_sphere_mesh, generate_cube_vertices
+from src.transform import compose_3d_transforms, create_3d_translation_matrix
+
+Point3D = namedtuple('Point3D', ['x', 'y', 'z'])
+
+# Object types that go through the depth-tested mesh path.
+OBJECT_TYPES_3D = ('sphere', 'cube_3d', 'mesh', 'instances')
+
+def is_3d(obj):
+    return obj['type'] in OBJECT_TYPES_3D
+
+def has_edges(obj):
+    """True if a 3D object (or an instance group's base) draws edges, which are not depth tested."""
+    if obj['type'] == 'instances':
+        return has_edges(obj['base'])
+    return 'edges' in obj and 'edge_color' in obj
+
+def model_matrix_for(obj):
+    """Builds the 4x4 model matrix of a 3D object from its config entry."""
+    model_matrix = compose_3d_transforms(obj.get('transform', []))
+    if obj['type'] in ('sphere', 'mesh'):
+        # These meshes are built around their own origin, so the center is a translation.
+        center = obj.get('center', [0, 0, 0])
+        model_matrix = np.dot(create_3d_translation_matrix(*center), model_matrix)
+    return model_matrix
+
+def object_mesh(obj, tessellation=None):
+    """
+    Returns the local-space mesh of a 3D object. For spheres, `tessellation` is an
+    optional (sectors, stacks) pair chosen by level-of-detail selection.
+
+    Returns:
+        tuple: A tuple containing:
+            - np.ndarray: An (N, 4) array of homogeneous vertices.
+            - list: A list of faces, where each face is a list of vertex indices
+              (an (F, 3) array for imported meshes).
+    """
+    if obj['type'] == 'mesh':
+        # Memory-mapped arrays from the mesh cache, used as-is
+        from src.mesh_io import load_mesh
+        return load_mesh(obj['path'], obj.get('cache_dir'))
+    if obj['type'] == 'sphere':
+        sectors, stacks = tessellation or (obj.get('sectors', 36), obj.get('stacks', 18))
+        vertices, faces = unit_sphere_mesh(sectors, stacks)
+        vertices = vertices.copy()
+        vertices[:, :3] *= obj.get('radius', 1)
+        return vertices, faces
+    else:
+        vertices = generate_cube_vertices(obj['center'], obj['size'])
+        faces = obj.get('faces', [])
+    return np.array(vertices, dtype=float), faces
+
+def local_center(obj):
+    """Returns the local-space center of a 3D object as a homogeneous 4-vector."""
+    if obj['type'] == 'instances':
+        return local_center(obj['base'])
+    if obj['type'] in ('sphere', 'mesh'):
+        return np.array([0, 0, 0, 1.0])
+    return np.array([*obj['center'], 1.0])
+
+def object_center(obj):
+    """Returns the world-space center of a 3D object as a homogeneous 4-vector."""
+    if obj['type'] == 'instances':
+        # An instance group is ordered by the centroid of its instances (or its base, if it has none)
+        model_matrices = instance_model_matrices(obj)
+        if len(model_matrices) == 0:
+            return object_center(obj['base'])
+        return np.dot(model_matrices, local_center(obj)).mean(axis=0)
+    return np.dot(model_matrix_for(obj), local_center(obj))
+
+def to_screen(clip, width, height, snap=True):
+    """
+    Maps clip-space coordinates (..., 4) to screen x, y and a depth value. x and y are
+    truncated to whole pixels unless `snap` is False (for sub-pixel rasterization).
+    The clip-space z (before the perspective divide) is kept for depth testing.
+    """
+    depth = clip[..., 2]
+    w = clip[..., 3]
+    safe_w = np.where(w != 0, w, 1)
+    ndc_x = clip[..., 0] / safe_w
+    ndc_y = clip[..., 1] / safe_w
+    screen_x = (ndc_x + 1) * 0.5 * width
+    screen_y = (1 - ndc_y) * 0.5 * height
+    if snap:
+        return screen_x.astype(int), screen_y.astype(int), depth
+    return screen_x, screen_y, depth
+
+def project_vertices(mvp_matrix, vertices, width, height, snap=True):
+    """Projects an (N, 4) vertex array to a list of screen-space Point3D in one matrix product."""
+    screen_x, screen_y, depth = to_screen(np.dot(vertices, mvp_matrix.T), width, height, snap)
+    return [Point3D(x, y, z) for x, y, z in zip(screen_x.tolist(), screen_y.tolist(), depth)]
+
+def project_instances(mvp_matrices, vertices, width, height, snap=True):
+    """
+    Projects a shared (N, 4) vertex array through an (I, 4, 4) stack of MVP matrices
+    in a single batched matmul. Returns one list of Point3D per instance.
+    """
+    clip = np.matmul(vertices, mvp_matrices.transpose(0, 2, 1))
+    screen_x, screen_y, depth = to_screen(clip, width, height, snap)
+    return [
+        [Point3D(x, y, z) for x, y, z in zip(xs.tolist(), ys.tolist(), zs)]
+        for xs, ys, zs in zip(screen_x, screen_y, depth)
+    ]
+
+def face_normals(world_vertices, faces):
+    """
+    Returns unit normals from the first three vertices of each face, and a mask of
+    the non-degenerate ones. `world_vertices` may carry leading batch dimensions,
+    e.g. (I, N, 4) for instances, in which case the results are (I, F, 3) and (I, F).
+    """
+    if len(faces) == 0:
+        shape = world_vertices.shape[:-2] + (0,)
+        return np.zeros(shape + (3,)), np.zeros(shape, dtype=bool)
+    if isinstance(faces, np.ndarray):
+        idx = faces[:, :3]
+    else:
+        idx = np.array([face[:3] for face in faces])
+    v0 = world_vertices[..., idx[:, 0], :3]
+    v1 = world_vertices[..., idx[:, 1], :3]
+    v2 = world_vertices[..., idx[:, 2], :3]
+    normals = np.cross(v1 - v0, v2 - v0)
+    lengths = np.linalg.norm(normals, axis=-1)[..., None]
+    unit = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths != 0)
+    return unit, lengths[..., 0] != 0
+
+def face_intensities(normals, ambient_light, directional_light):
+    """Returns the flat-shading light intensity for each normal (any leading shape)."""
+    light_dir = np.array(directional_light['direction'], dtype=float)
+    light_dir = light_dir / np.linalg.norm(light_dir)
+    diffuse_intensity = np.maximum(0, np.dot(normals, light_dir))
+    ambient_intensity = ambient_light['intensity'] if ambient_light else 0.1
+    return ambient_intensity + (diffuse_intensity * directional_light.get('intensity', 1.0))
+
+def shade_faces(world_vertices, faces, color, ambient_light, directional_light):
+    """
+    Flat-shades all faces of a mesh at once.
+
+    Returns:
+        list: A Colour per face, or None for degenerate faces that should be skipped.
+    """
+    if len(faces) == 0:
+        return []
+    normals, valid = face_normals(world_vertices, faces)
+    if not directional_light:
+        return [color if ok else None for ok in valid]
+
+    total_intensity = face_intensities(normals, ambient_light, directional_light)
+    rgb = np.minimum(255, np.array(color.to_tuple()) * total_intensity[:, None])
+    return [Colour(*c) if ok else None for c, ok in zip(rgb, valid)]
+
+def shade_instances(world_vertices, faces, colours, ambient_light, directional_light):
+    """
+    Flat-shades every face of every instance in bulk.
+
+    Args:
+        world_vertices (np.ndarray): An (I, N, 4) array of world-space vertices.
+        faces (list): The faces shared by all instances.
+        colours (list): One base Colour per instance.
+
+    Returns:
+        list: One list per instance with a Colour per face (None for degenerate faces).
+    """
+    if len(faces) == 0:
+        return [[] for _ in colours]
+    normals, valid = face_normals(world_vertices, faces)
+    base = np.array([c.to_tuple() for c in colours], dtype=float)[:, None, :]
+    if directional_light:
+        rgb = np.minimum(255, base * face_intensities(normals, ambient_light, directional_light)[..., None])
+    else:
+        rgb = np.broadcast_to(base, valid.shape + (3,))
+    return [
+        [Colour(*c) if ok else None for c, ok in zip(instance_rgb, instance_valid)]
+        for instance_rgb, instance_valid in zip(rgb, valid)
+    ]
+
+# --- Instancing ---
+
+def instance_model_matrices(obj):
+    """
+    Returns an (I, 4, 4) stack of model matrices for an `instances` object.
+    Each instance transform is applied after the base object's own placement.
+    """
+    base_model = model_matrix_for(obj['base'])
+    return np.array([np.dot(compose_3d_transforms(t), base_model) for t in obj['transforms']]).reshape(-1, 4, 4)
+
+def instance_colours(obj, materials, default):
+    """
+    Returns one Colour per instance from the optional `materials` list. The whole
+    group is drawn with the opacity of its own `material`, so an instance material
+    with a different opacity is rejected with a warning and the default is used.
+    """
+    names = obj.get('materials')
+    if not names:
+        return [default] * len(obj['transforms'])
+    group_opacity = material_opacity(materials.get(obj['material'], {}))
+    colours = []
+    for i, name in enumerate(names[:len(obj['transforms'])]):
+        if name not in materials or 'color' not in materials[name]:
+            print(f"Warning: Material '{name}' not found for instance {i} of '{obj['name']}'. Using '{obj['material']}'.",
+                  file=sys.stderr)
+            colours.append(default)
+        elif material_opacity(materials[name]) != group_opacity:
+            print(f"Warning: Material '{name}' of instance {i} of '{obj['name']}' has a different opacity than "
+                  f"'{obj['material']}', which all instances share. Using '{obj['material']}'.", file=sys.stderr)
+            colours.append(default)
+        else:
+            colours.append(Colour(*materials[name]['color']))
+    colours += [default] * (len(obj['transforms']) - len(colours))
+    return colours
+
+def cull_instances(planes, model_matrices, vertices):
+    """
+    Frustum-culls all instances at once using the bounding sphere of the shared mesh.
+
+    Returns:
+        np.ndarray: A boolean mask of the instances that may be visible.
+    """
+    lo, hi = vertices[:, :3].min(axis=0), vertices[:, :3].max(axis=0)
+    center = np.append((lo + hi) / 2, 1.0)
+    radius = np.linalg.norm(vertices[:, :3] - center[:3], axis=1).max()
+
+    world_centers = np.dot(model_matrices, center)                          # (I, 4)
+    scales = np.linalg.norm(model_matrices[:, :3, :3], axis=1).max(axis=1)  # largest axis scale
+    distances = np.dot(world_centers, planes.T)                             # (I, P)
+    return np.all(distances >= -(radius * scales)[:, None], axis=1)
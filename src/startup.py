@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+# Cold-start budget for `import main` on a fresh interpreter, measured with
+# `python -X importtime`. It excludes NumPy, which every job needs and which
+# alone takes ~90-110 ms; our own modules take ~20 ms. Before PIL, yaml and
+# argparse were made lazy they added another ~85 ms.
+IMPORT_BUDGET_MS = 30
+
+# Imported by every render, so its cost is reported but not budgeted.
+REQUIRED_MODULES = ('numpy',)
+
+# Modules (and their submodules) that must not be loaded just by importing the
+# entry point: third-party packages, and render subsystems loaded when a render
+# starts or an object needs them.
+LAZY_MODULES = ('PIL', 'yaml', 'src.raster.clip', 'src.raster.kernels', 'src.raster.blend', 'src.lod', 'src.ordering')
+
+def lazy_modules_loaded(names):
+    """Returns the LAZY_MODULES that are among, or a package of, the given module names."""
+    return sorted(lazy for lazy in LAZY_MODULES if any(name == lazy or name.startswith(lazy + '.') for name in names))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_import_time(module='main', runs=5):
+    """
+    Imports `module` in `runs` fresh interpreters with `-X importtime`.
+
+    Returns:
+        tuple: A tuple containing:
+            - float: The fastest import time of `module` in ms, excluding REQUIRED_MODULES.
+            - float: The import time of REQUIRED_MODULES in that run.
+            - list: (cumulative ms, name) for every module loaded in that run.
+    """
+    best_ms, best_required_ms, best_modules = None, 0.0, []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, cwd=PROJECT_ROOT
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr}")
+        modules = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            # Drop the separator space; what remains is two spaces of indent per nesting level
+            modules.append((int(cumulative) / 1000.0, name[1:].rstrip()))
+        total_ms = next(ms for ms, name in reversed(modules) if name.strip() == module)
+        required_ms = sum(ms for ms, name in modules if name.strip() in REQUIRED_MODULES)
+        if best_ms is None or total_ms - required_ms < best_ms:
+            best_ms, best_required_ms, best_modules = total_ms - required_ms, required_ms, modules
+    return best_ms, best_required_ms, best_modules
+
+def check_import_budget(module='main', budget_ms=IMPORT_BUDGET_MS):
+    """
+    Prints the cold-start import time of `module` and its heaviest direct imports.
+    Returns False if it exceeds the budget or eagerly loads one of LAZY_MODULES.
+    """
+    total_ms, required_ms, modules = measure_import_time(module)
+    print(f"Import time of '{module}': {total_ms:.1f} ms (budget {budget_ms:.0f} ms), "
+          f"plus {required_ms:.1f} ms for {', '.join(REQUIRED_MODULES)}")
+    # Direct imports of the module are indented by exactly two spaces
+    direct = sorted(((ms, name.strip()) for ms, name in modules if name.startswith('  ') and name[2] != ' '), reverse=True)
+    for ms, name in direct[:5]:
+        print(f"  - {name}: {ms:.1f} ms")
+
+    ok = total_ms <= budget_ms
+    if not ok:
+        print(f"Error: import time is {total_ms - budget_ms:.1f} ms over budget.")
+    eager = lazy_modules_loaded(name.strip() for _, name in modules)
+    if eager:
+        print(f"Error: {', '.join(eager)} should be imported lazily but {'is' if len(eager) == 1 else 'are'} "
+              f"loaded by 'import {module}'.")
+        ok = False
+    return ok
@@ -103,3 +103,23 @@ def create_perspective_projection_matrix(fov, aspect_ratio, near, far):
         [0, 0, (far + near) / (near - far), (2 * far * near) / (near - far)],
         [0, 0, -1, 0]
     ])
+
+# --- Transform Lists ---
+
+def compose_3d_transforms(transforms):
+    """Combines a config transform list into a single 4x4 model matrix."""
+    model_matrix = np.identity(4)
+    for t in reversed(transforms):
+        m = np.identity(4)
+        if t['type'] == 'translate_3d':
+            m = create_3d_translation_matrix(*t['offset'])
+        elif t['type'] == 'rotate_x':
+            m = create_3d_rotation_matrix_x(t['angle'])
+        elif t['type'] == 'rotate_y':
+            m = create_3d_rotation_matrix_y(t['angle'])
+        elif t['type'] == 'rotate_z':
+            m = create_3d_rotation_matrix_z(t['angle'])
+        elif t['type'] == 'scale_3d':
+            m = create_3d_scaling_matrix(*t['factor'])
+        model_matrix = np.dot(model_matrix, m)
+    return model_matrix
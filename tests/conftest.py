@@ -0,0 +1,11 @@
+import os
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+@pytest.fixture(autouse=True)
+def project_cwd(monkeypatch):
+    """Runs every test from the project root, where config paths like `inputs/...` resolve."""
+    monkeypatch.chdir(PROJECT_ROOT)
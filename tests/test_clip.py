@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from src.raster import kernels
+from src.raster.clip import ClipStats, clip_line
+
+reference = kernels.load_backend('python')
+
+RECT = (0, 0, 199, 149)  # xmin, ymin, xmax, ymax, inclusive
+
+def visible(pixels, rect=RECT):
+    xmin, ymin, xmax, ymax = rect
+    keep = (pixels[:, 0] >= xmin) & (pixels[:, 0] <= xmax) & (pixels[:, 1] >= ymin) & (pixels[:, 1] <= ymax)
+    return pixels[keep]
+
+@pytest.mark.parametrize('integer', [True, False], ids=['integer', 'float'])
+def test_clipped_line_is_unclipped_line_on_canvas(integer):
+    # Clipping must only drop off-canvas pixels, never move the ones that remain
+    rng = np.random.default_rng(0)
+    for _ in range(3000):
+        line = rng.uniform(-400, 600, 4)
+        if integer:
+            line = np.round(line)
+        x0, y0, x1, y1 = (float(v) for v in line)
+        expected = visible(reference.line_pixels(int(x0), int(y0), int(x1), int(y1)))
+        segment = clip_line(x0, y0, x1, y1, RECT)
+        if segment is None:
+            assert len(expected) == 0
+        else:
+            np.testing.assert_array_equal(reference.line_pixels(*segment), expected)
+
+def test_clip_line_stats():
+    stats = ClipStats()
+    assert clip_line(10, 10, 50, 40, RECT, stats) == (10, 10, 50, 40, 0, 40)
+    assert clip_line(-50, 20, 50, 20, RECT, stats) == (-50, 20, 50, 20, 50, 100)
+    assert clip_line(300, 300, 400, 320, RECT, stats) is None
+    # Passes the corner's bounding box but no pixel of it is inside
+    assert clip_line(190, -20, 230, 20, RECT, stats) is None
+    assert stats.counts['lines'] == {'inside': 1, 'clipped': 1, 'rejected': 2}
@@ -0,0 +1,26 @@
+import numpy as np
+import main
+from main import Scene, render_frames
+
+class FakeCanvas:
+    def to_array(self):
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+def test_orbit_frames_are_evenly_spaced(monkeypatch, tmp_path):
+    scene = Scene('inputs/config.yaml')
+    camera = scene.camera
+    start = camera.position.copy()
+    positions = []
+    monkeypatch.setattr(main, 'render_scene', lambda scene, *args, **kwargs:
+                        positions.append(scene.camera.position.copy()) or FakeCanvas())
+
+    render_frames(scene, 8, 360, ('npy', str(tmp_path / 'frames.npy'), 8, 25, 6))
+
+    # Angle of each position around the up axis, measured from the start position
+    offsets = np.array(positions) - camera.target
+    first = start - camera.target
+    first -= camera.up * np.dot(first, camera.up)
+    side = np.cross(camera.up, first)
+    angles = np.degrees(np.arctan2(offsets @ side / np.linalg.norm(side), offsets @ first / np.linalg.norm(first)))
+    np.testing.assert_allclose(np.mod(angles, 360), np.arange(8) * 45.0, atol=1e-6)
+    np.testing.assert_array_equal(camera.position, start)
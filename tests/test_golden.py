@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from PIL import Image
+from main import Scene, render_scene
+from src.golden import CORPUS, golden_path, compare_images, update_goldens, _render_case
+from src.raster import kernels
+
+def render(scene, objects):
+    return render_scene(scene, objects, output_path=None, show=False).to_array()
+
+@pytest.mark.parametrize('backend', kernels.available_backends())
+@pytest.mark.parametrize('case', CORPUS, ids=[case.name for case in CORPUS])
+def test_matches_golden(case, backend):
+    golden = np.asarray(Image.open(golden_path(case)).convert('RGB'))
+    pixels = _render_case(Scene(case.config), case, render, backend)
+    result = compare_images(pixels, golden, case.channel_tolerance, case.pixel_tolerance)
+    assert result['passed'], result
+
+def test_update_skips_pinned_goldens(tmp_path):
+    # The baseline golden is the original renderer's output, so re-rendering must never replace it
+    class FakeScene:
+        renderer_options = {}
+        objects = []
+    rendered = []
+    def fake_render(scene, objects):
+        rendered.append(scene)
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+    update_goldens(lambda config: FakeScene(), fake_render, golden_dir=str(tmp_path))
+    written = {path.stem for path in tmp_path.iterdir()}
+    assert written == {case.name for case in CORPUS if not case.golden and not case.pinned}
+    assert 'baseline' not in written
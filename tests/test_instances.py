@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from main import Scene, render_scene
+from src.helper import load_config
+
+def empty_group_scene():
+    config = load_config('inputs/config.yaml')
+    objects = config['scene']['objects']
+    group = next(obj for obj in objects if obj['type'] == 'instances')
+    group['transforms'] = []
+    group.pop('materials', None)
+    return Scene(config), group['name']
+
+@pytest.mark.parametrize('deferred', [False, True])
+def test_empty_instance_group_draws_nothing(deferred):
+    scene, name = empty_group_scene()
+    scene.renderer_options['deferred'] = deferred
+    with_group = render_scene(scene, output_path=None, show=False).to_array()
+    others = [obj['name'] for obj in scene.objects if obj['name'] != name]
+    without_group = render_scene(scene, others, output_path=None, show=False).to_array()
+    assert np.array_equal(with_group, without_group)
+
+def test_instance_materials_cannot_change_the_group_opacity(capsys):
+    config = load_config('inputs/config.yaml')
+    group = next(obj for obj in config['scene']['objects'] if obj['type'] == 'instances')
+    scene = Scene(config)
+    group['materials'] = [group['material']] * len(group['transforms'])
+    expected = render_scene(scene, [group['name']], output_path=None, show=False).to_array()
+    group['materials'][1] = 'blue_glass'
+    pixels = render_scene(scene, [group['name']], output_path=None, show=False).to_array()
+    assert np.array_equal(pixels, expected)
+    assert "'blue_glass' of instance 1" in capsys.readouterr().err
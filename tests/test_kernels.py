@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+from main import Scene, render_scene
+from src.raster import kernels
+from src.raster.triangle import to_fixed_point
+
+# Every backend must produce exactly the reference kernels' pixels, in the same order
+reference = kernels.load_backend('python')
+
+def optional_backend(name):
+    try:
+        return kernels.load_backend(name)
+    except ImportError:
+        return None
+
+BACKENDS = [
+    pytest.param('numpy', id='numpy'),
+    pytest.param('numba', id='numba', marks=pytest.mark.skipif(optional_backend('numba') is None,
+                                                              reason='numba is not installed')),
+]
+
+BOUNDS = (0, 0, 199, 149)  # col_min, row_min, col_max, row_max
+
+def random_triangles(rng, count=300):
+    """Seeded triangles: random, degenerate (collinear or repeated vertices) and partly or fully off-screen."""
+    triangles = [rng.uniform(-50, 250, (3, 2)) for _ in range(count)]
+    triangles += [np.round(t) for t in triangles[:50]]                      # on the pixel grid
+    triangles += [np.array([[10, 10], [50, 50], [90, 90.0]])]               # collinear
+    triangles += [np.array([[20, 30], [20, 30], [60, 80.0]])]               # repeated vertex
+    triangles += [np.full((3, 2), 40.0)]                                    # a single point
+    triangles += [np.array([[0, 5], [80, 5], [40, 5.0]])]                   # horizontal sliver
+    triangles += [rng.uniform(300, 900, (3, 2)) for _ in range(10)]         # entirely off-screen
+    triangles += [rng.uniform(-5000, 5000, (3, 2)) for _ in range(10)]      # huge, clamped to the bounds
+    return triangles
+
+def assert_same(expected, actual):
+    if isinstance(expected, tuple):
+        for e, a in zip(expected, actual):
+            np.testing.assert_array_equal(a, e)
+    else:
+        np.testing.assert_array_equal(actual, expected)
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_line_pixels(name):
+    backend = kernels.load_backend(name)
+    rng = np.random.default_rng(0)
+    lines = [tuple(int(v) for v in rng.integers(-300, 300, 4)) for _ in range(300)]
+    lines += [(5, 5, 5, 5), (-3, 7, -3, 7), (0, 0, 10, 0), (0, 0, 0, -10), (0, 0, 7, 7), (0, 0, -7, 7)]
+    for line in lines:
+        assert_same(reference.line_pixels(*line), backend.line_pixels(*line))
+
+@pytest.mark.parametrize('name', ['python'] + BACKENDS)
+def test_line_pixels_step_range(name):
+    # A range of steps is exactly that slice of the full line, so clipping can resume mid-line
+    backend = kernels.load_backend(name)
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        line = tuple(int(v) for v in rng.integers(-100, 100, 4))
+        full = reference.line_pixels(*line)
+        k_start, k_end = sorted(int(k) for k in rng.integers(0, len(full), 2))
+        assert_same(full[k_start:k_end + 1], backend.line_pixels(*line, k_start, k_end))
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_circle_outline(name):
+    backend = kernels.load_backend(name)
+    for radius in list(range(0, 60)) + [97, 250]:
+        assert_same(reference.circle_outline(radius), backend.circle_outline(radius))
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_disk_pixels(name):
+    backend = kernels.load_backend(name)
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        xc, yc = (int(v) for v in rng.integers(-20, 220, 2))
+        radius = int(rng.integers(0, 40))
+        # The rasterizer passes the circle's box clamped to the canvas, which may be empty
+        box = (max(xc - radius, 0), min(xc + radius, 199), max(yc - radius, 0), min(yc + radius, 149))
+        assert_same(reference.disk_pixels(xc, yc, radius, *box), backend.disk_pixels(xc, yc, radius, *box))
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_triangle_pixels(name):
+    backend = kernels.load_backend(name)
+    for triangle in random_triangles(np.random.default_rng(2)):
+        assert_same(reference.triangle_pixels(triangle, *BOUNDS), backend.triangle_pixels(triangle, *BOUNDS))
+
+@pytest.mark.parametrize('name', BACKENDS)
+@pytest.mark.parametrize('bits', [1, 4, 8])
+def test_triangle_pixels_fixed(name, bits):
+    backend = kernels.load_backend(name)
+    for triangle in random_triangles(np.random.default_rng(3)):
+        fixed = to_fixed_point(triangle, bits)
+        assert_same(reference.triangle_pixels_fixed(fixed, bits, *BOUNDS),
+                    backend.triangle_pixels_fixed(fixed, bits, *BOUNDS))
+
+def test_triangle_pixels_fixed_covers_shared_edges_once():
+    rng = np.random.default_rng(4)
+    for _ in range(200):
+        # A convex quad split along a diagonal: every pixel is covered by at most one half
+        angles = np.sort(rng.uniform(0, 2 * np.pi, 4))
+        quad = to_fixed_point(np.column_stack([100 + 60 * np.cos(angles), 75 + 60 * np.sin(angles)]), 8)
+        coverage = np.zeros((200, 150), dtype=int)
+        for triangle in (quad[[0, 1, 2]], quad[[0, 2, 3]]):
+            xs, ys = reference.triangle_pixels_fixed(triangle, 8, *BOUNDS)
+            np.add.at(coverage, (xs, ys), 1)
+        assert coverage.max() <= 1
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_depth_test(name):
+    backend = kernels.load_backend(name)
+    rng = np.random.default_rng(5)
+    z_start = rng.uniform(0, 10, (200, 150)).astype(np.float32)
+    z_start[rng.random((200, 150)) < 0.2] = np.inf
+    for _ in range(50):
+        count = int(rng.integers(0, 500))
+        # A batch never lists a pixel twice, as for a single triangle
+        flat = rng.choice(200 * 150, count, replace=False)
+        xs, ys = (flat // 150).astype(np.int64), (flat % 150).astype(np.int64)
+        depth = np.float64(rng.uniform(0, 10))
+        z_expected, z_actual = z_start.copy(), z_start.copy()
+        passed = backend.depth_test(z_actual, xs, ys, depth)
+        assert_same(reference.depth_test(z_expected, xs, ys, depth), passed)
+        assert_same(z_expected, z_actual)
+
+@pytest.mark.parametrize('name', BACKENDS)
+def test_scene_renders_identically(name):
+    scene = Scene('inputs/config.yaml')
+    pixels = {}
+    for backend in ('python', name):
+        scene.renderer_options['kernel_backend'] = backend
+        pixels[backend] = render_scene(scene, output_path=None, show=False).to_array()
+    assert_same(pixels['python'], pixels[name])
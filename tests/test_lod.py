@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from main import Scene, render_scene
+from src.helper import load_config
+from src.lod import SPHERE_LOD_LEVELS, sphere_tessellation_error, select_sphere_level, sphere_lod
+
+def test_tessellation_error_is_the_sector_sagitta():
+    assert sphere_tessellation_error(100, 4) == pytest.approx(100 * (1 - np.cos(np.pi / 4)))
+    assert sphere_tessellation_error(0, 6) == 0
+
+@pytest.mark.parametrize('screen_radius', [0, 1, 5, 20, 80, 300, 1000])
+def test_selects_the_coarsest_level_within_tolerance(screen_radius):
+    sectors, stacks = select_sphere_level(screen_radius, 0.5, 1000, 1000)
+    assert sphere_tessellation_error(screen_radius, sectors) <= 0.5 or (sectors, stacks) == (1000, 1000)
+    coarser = [level for level in SPHERE_LOD_LEVELS if level[0] < sectors]
+    assert all(sphere_tessellation_error(screen_radius, s) > 0.5 for s, _ in coarser)
+
+def test_level_grows_with_screen_size():
+    levels = [select_sphere_level(r, 0.5, 1000, 1000)[0] for r in (1, 10, 50, 200, 800)]
+    assert levels == sorted(levels) and levels[0] < levels[-1]
+
+def test_configured_sectors_and_stacks_cap_the_level():
+    assert select_sphere_level(10000, 0.5, 10, 7) == (10, 7)  # no level is fine enough
+    assert select_sphere_level(50, 0.5, 64, 4)[1] == 4        # stacks capped on their own
+    assert select_sphere_level(0, 0.5, 4, 2) == (4, 2)         # coarser than the coarsest level
+
+def test_group_level_follows_its_nearest_instance():
+    scene = Scene('inputs/config.yaml')
+    sphere = {'type': 'sphere', 'radius': 10}
+    near, far = np.identity(4), np.identity(4)
+    near[:3, 3] = [0, 0, -150]
+    far[:3, 3] = [0, 0, 400]
+    args = (scene.camera, scene.camera_type, 1200)
+    assert sphere_lod(sphere, np.stack([near, far]), *args) == sphere_lod(sphere, near, *args)
+    assert sphere_lod(sphere, far, *args)[0] < sphere_lod(sphere, near, *args)[0]
+
+def test_culled_instances_do_not_refine_the_level():
+    config = load_config('inputs/config.yaml')
+    group = next(obj for obj in config['scene']['objects'] if obj['type'] == 'instances')
+    group.pop('materials', None)
+    group['base'].update(sectors=64, stacks=32)
+    # Close to the camera, so it would need a fine mesh, but outside the view
+    group['transforms'] = [[{'type': 'translate_3d', 'offset': [-150, 120, 0]}]]
+    scene = Scene(config)
+    expected = render_scene(scene, [group['name']], output_path=None, show=False).to_array()
+    group['transforms'].append([{'type': 'translate_3d', 'offset': [400, 0, -230]}])
+    pixels = render_scene(scene, [group['name']], output_path=None, show=False).to_array()
+    np.testing.assert_array_equal(pixels, expected)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from src.mesh_io import load_mesh, parse_obj, parse_ply
+
+def write_obj(tmp_path, text):
+    path = tmp_path / 'model.obj'
+    path.write_text(text)
+    return str(path)
+
+def test_negative_indices_count_back_from_vertices_defined_so_far(tmp_path):
+    path = write_obj(tmp_path, "v 0 0 0\nv 1 0 0\nv 0 1 0\nf -3 -2 -1\n"
+                               "v 2 0 0\nv 3 0 0\nv 2 1 0\nf -3 -2 -1\n")
+    vertices, faces = parse_obj(path)
+    assert len(vertices) == 6
+    assert faces.tolist() == [[0, 1, 2], [3, 4, 5]]
+
+def test_inline_comments_are_ignored(tmp_path):
+    path = write_obj(tmp_path, "# a quad\nv 0 0 0 # origin\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4 # quad\n")
+    vertices, faces = parse_obj(path)
+    assert vertices.tolist()[0] == [0, 0, 0]
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+def test_corner_layouts(tmp_path):
+    path = write_obj(tmp_path, "v 0 0 0\nv 1 0 0\nv 0 1 0\nvt 0 0\nvn 0 0 1\nf 1/1/1 2/1/1 3/1/1\nf 1//1 2//1 3//1\n")
+    vertices, faces = parse_obj(path)
+    assert faces.tolist() == [[0, 1, 2], [0, 1, 2]]
+
+def test_tabs_and_w_components(tmp_path):
+    path = write_obj(tmp_path, "v\t0 0 0 1\nv 1\t0 0\t1\nv\t0 1 0\r\nv 1 1 0\nf\t1 2 3\nf 2\t4\t3\n")
+    vertices, faces = parse_obj(path)
+    assert vertices.tolist() == [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]]
+    assert faces.tolist() == [[0, 1, 2], [1, 3, 2]]
+
+def test_obj_faces_keep_file_order(tmp_path):
+    path = write_obj(tmp_path, "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nv 2 0 0\n"
+                               "f 1 2 3 4\nf 2 5 3\nf 4 3 2 1\n")
+    vertices, faces = parse_obj(path)
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3], [1, 4, 2], [3, 2, 1], [3, 1, 0]]
+
+def write_ply(tmp_path, vertices, faces, order='<', count_type='u1', index_type='i4'):
+    names = {'u1': 'uchar', 'i4': 'int', 'u4': 'uint'}
+    endian = 'binary_little_endian' if order == '<' else 'binary_big_endian'
+    header = (f"ply\nformat {endian} 1.0\ncomment test model\nelement vertex {len(vertices)}\n"
+              "property float x\nproperty float y\nproperty float z\n"
+              f"element face {len(faces)}\nproperty list {names[count_type]} {names[index_type]} vertex_indices\n"
+              "end_header\n")
+    body = np.asarray(vertices, dtype=order + 'f4').tobytes()
+    for face in faces:
+        body += np.array([len(face)], dtype=order + count_type).tobytes()
+        body += np.asarray(face, dtype=order + index_type).tobytes()
+    path = tmp_path / 'model.ply'
+    path.write_bytes(header.encode('ascii') + body)
+    return str(path)
+
+SQUARE = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]]
+
+@pytest.mark.parametrize('order', ['<', '>'])
+def test_ply_triangles(tmp_path, order):
+    vertices, faces = parse_ply(write_ply(tmp_path, SQUARE, [[0, 1, 2], [0, 2, 3]], order))
+    np.testing.assert_array_equal(vertices, SQUARE)
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+def test_ply_mixed_faces_keep_file_order(tmp_path):
+    path = write_ply(tmp_path, SQUARE, [[1, 4, 2], [0, 1, 2, 3], [3, 2, 1]])
+    vertices, faces = parse_ply(path)
+    assert faces.tolist() == [[1, 4, 2], [0, 1, 2], [0, 2, 3], [3, 2, 1]]
+
+def test_load_mesh_caches_the_parse(tmp_path):
+    path = write_ply(tmp_path, SQUARE, [[0, 1, 2, 3]])
+    vertices, faces = load_mesh(path)
+    assert vertices.shape == (5, 4) and faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+    cached_vertices, cached_faces = load_mesh(path)
+    assert isinstance(cached_faces, np.memmap)
+    np.testing.assert_array_equal(cached_vertices, vertices)
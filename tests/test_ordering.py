@@ -0,0 +1,55 @@
+import numpy as np
+from main import Scene, render_scene
+from src.ordering import order_render_list
+
+def render(sort_objects, deferred=False):
+    scene = Scene('inputs/config.yaml')
+    scene.renderer_options.update(sort_objects=sort_objects, deferred=deferred)
+    return render_scene(scene, output_path=None, show=False).to_array()
+
+def test_sorting_does_not_change_the_image():
+    assert np.array_equal(render(True), render(False))
+
+def test_sorting_does_not_change_the_deferred_image():
+    assert np.array_equal(render(True, deferred=True), render(False, deferred=True))
+
+def test_objects_with_edges_keep_their_place():
+    # Camera looks down -z, so a larger z is farther away
+    objects = [{'name': 'far', 'z': 9}, {'name': 'edged', 'z': 5, 'edges': True},
+               {'name': 'mid', 'z': 3}, {'name': 'near', 'z': 1}]
+    ordered = order_render_list(objects, np.identity(4), lambda obj: True,
+                                lambda obj: np.array([0, 0, -obj['z'], 1.0]),
+                                has_edges=lambda obj: obj.get('edges', False))
+    assert [obj['name'] for obj in ordered] == ['far', 'edged', 'near', 'mid']
+
+def glass_before_edged_cube(reverse):
+    cube_faces = [[0, 1, 2, 3], [4, 5, 6, 7], [0, 4, 7, 3], [1, 5, 6, 2], [3, 2, 6, 7], [0, 1, 5, 4]]
+    cube_edges = [[0, 1], [1, 2], [2, 3], [3, 0], [4, 5], [5, 6], [6, 7], [7, 4], [0, 4], [1, 5], [2, 6], [3, 7]]
+    objects = [
+        {'name': 'glass', 'type': 'sphere', 'material': 'glass', 'center': [0, 0, -60], 'radius': 40},
+        {'name': 'cube', 'type': 'cube_3d', 'material': 'blue', 'edge_color': 'black', 'center': [0, 0, 40],
+         'size': 80, 'faces': cube_faces, 'edges': cube_edges},
+    ]
+    config = {'scene': {
+        'image_settings': {'width': 320, 'height': 240, 'background_color': [255, 255, 255]},
+        'camera': {'type': 'perspective', 'position': [0, -50, -250], 'target': [0, 0, 0], 'up': [0, 1, 0],
+                   'fov': 60, 'near': 0.1, 'far': 100},
+        'lights': [{'type': 'directional', 'direction': [-1, 0, 0], 'color': [255, 255, 255], 'intensity': 0.8},
+                   {'type': 'ambient', 'color': [255, 255, 255], 'intensity': 0.5}],
+        'materials': {'glass': {'color': [0, 128, 255], 'opacity': 0.5}, 'blue': {'color': [0, 0, 255]},
+                      'black': {'color': [0, 0, 0]}},
+        'objects': objects[::-1] if reverse else objects,
+    }}
+    return render_scene(Scene(config), output_path=None, show=False).to_array()
+
+def test_translucent_objects_draw_after_edged_opaque_ones():
+    assert np.array_equal(glass_before_edged_cube(False), glass_before_edged_cube(True))
+
+def test_translucent_objects_move_past_edged_ones():
+    objects = [{'name': 'glass', 'z': 1, 'glass': True}, {'name': 'edged', 'z': 5, 'edges': True},
+               {'name': 'near', 'z': 2}]
+    ordered = order_render_list(objects, np.identity(4), lambda obj: True,
+                                lambda obj: np.array([0, 0, -obj['z'], 1.0]),
+                                is_translucent=lambda obj: obj.get('glass', False),
+                                has_edges=lambda obj: obj.get('edges', False))
+    assert [obj['name'] for obj in ordered] == ['edged', 'near', 'glass']
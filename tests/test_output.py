@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from PIL import Image
+from src.output import FrameEncoder, open_sink, png_pattern
+
+def frames(count=3, height=4, width=5):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_npy_sink_stacks_frames(tmp_path, mode):
+    path = str(tmp_path / 'frames.npy')
+    encoder = FrameEncoder(('npy', path, 3), mode=mode)
+    for frame in frames():
+        encoder.submit(frame)
+    encoder.close()
+    stack = np.load(path)
+    assert stack.shape == (3, 4, 5, 3) and stack.dtype == np.uint8
+    np.testing.assert_array_equal(stack, np.stack(frames()))
+
+def test_y4m_sink_writes_header_and_planes(tmp_path):
+    path = tmp_path / 'frames.y4m'
+    sink = open_sink('y4m', str(path), fps=30)
+    black_white = np.zeros((4, 5, 3), dtype=np.uint8)
+    black_white[:, 3:] = 255
+    for i in range(2):
+        sink.write(black_white, i)
+    sink.close()
+
+    data = path.read_bytes()
+    header, rest = data.split(b'\n', 1)
+    assert header == b'YUV4MPEG2 W5 H4 F30:1 Ip A1:1 C444'
+    frame_size = len(b'FRAME\n') + 3 * 4 * 5
+    assert len(rest) == 2 * frame_size
+    assert rest[:6] == b'FRAME\n'
+    # Full Y, then U, then V planes in row-major order, BT.601 limited range
+    y, u, v = np.frombuffer(rest[6:frame_size], dtype=np.uint8).reshape(3, 4, 5)
+    np.testing.assert_array_equal(y, np.where(black_white[..., 0] == 255, 235, 16))
+    np.testing.assert_array_equal(u, 128)
+    np.testing.assert_array_equal(v, 128)
+
+def test_raw_sink_appends_packed_rgb(tmp_path):
+    path = tmp_path / 'frames.rgb'
+    sink = open_sink('raw', str(path))
+    for i, frame in enumerate(frames()):
+        sink.write(frame, i)
+    sink.close()
+    assert path.read_bytes() == b''.join(frame.tobytes() for frame in frames())
+
+def test_png_sink_numbers_files(tmp_path):
+    sink = open_sink('png', png_pattern(str(tmp_path / 'out.png')))
+    for i, frame in enumerate(frames(2)):
+        sink.write(frame, i)
+    np.testing.assert_array_equal(np.asarray(Image.open(tmp_path / 'out_0001.png')), frames(2)[1])
+
+def test_png_pattern():
+    assert png_pattern('frame_%04d.png') == 'frame_%04d.png'
+    assert png_pattern('out.png') == 'out_%04d.png'
+    assert png_pattern('100%%.png') == '100%%_%04d.png'
+    with pytest.raises(ValueError):
+        png_pattern('frame_%d_%d.png')
+
+class FailingSink:
+    def write(self, frame, index):
+        raise OSError('disk full')
+
+    def close(self):
+        pass
+
+def test_encoder_raises_sink_errors(monkeypatch):
+    monkeypatch.setattr('src.output.open_sink', lambda *args: FailingSink())
+    encoder = FrameEncoder(('raw', 'unused'))
+    encoder.submit(frames(1)[0])
+    with pytest.raises(OSError, match='disk full'):
+        encoder.close()
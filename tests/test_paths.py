@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+from main import Scene, render_scene
+
+DEGENERATE_PATHS = [
+    {'name': 'empty', 'type': 'path', 'material': 'black_plastic', 'start': [0, 0], 'segments': []},
+    {'name': 'empty_filled', 'type': 'path', 'material': 'black_plastic', 'fill': True, 'start': [0, 0], 'segments': []},
+    {'name': 'one_pixel', 'type': 'path', 'material': 'black_plastic', 'fill': True, 'start': [10.2, 10.2],
+     'segments': [{'type': 'line', 'to': [10.4, 10.3]}, {'type': 'line', 'to': [10.2, 10.2]}]},
+]
+
+@pytest.mark.parametrize('path', DEGENERATE_PATHS, ids=[path['name'] for path in DEGENERATE_PATHS])
+def test_degenerate_paths_are_skipped(path):
+    scene = Scene('inputs/config.yaml')
+    expected = render_scene(scene, output_path=None, show=False).to_array()
+    scene.objects.append(path)
+    np.testing.assert_array_equal(render_scene(scene, output_path=None, show=False).to_array(), expected)
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+from src.startup import PROJECT_ROOT, IMPORT_BUDGET_MS, check_import_budget
+
+# Wall-clock timings vary on loaded machines, so the test allows twice the CLI budget
+# (the fastest of several cold imports is measured). Set IMPORT_BUDGET_MS to override.
+TEST_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', 2 * IMPORT_BUDGET_MS))
+
+def test_import_main_is_within_budget():
+    assert check_import_budget('main', TEST_BUDGET_MS)
+
+def test_heavy_modules_stay_lazy():
+    # A fresh interpreter, since other tests import PIL, yaml and the render modules into this one
+    code = "import sys, main; from src.startup import lazy_modules_loaded; print(','.join(lazy_modules_loaded(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=PROJECT_ROOT, check=True)
+    assert result.stdout.strip() == ''